@@ -3,18 +3,31 @@ AI layer (README: Features 3–4, 6–7).
 - Intent detection (Feature 3)
 - Plain English explanation (Feature 4)
 - Risk signals (Feature 6)
-- OpenRouter: cross-check and fallback (Feature 7)
+- OpenRouter: fallback, and cross-check on request / for a sampled fraction of requests (Feature 7)
+- Streaming: stream_explanation / explain_group_stream emit each section as soon as its header closes
+- LLM dispatch: per-provider token buckets (RPM + tokens/min), circuit breaker, priority queues
+- Compact prompts: tabular tx data within PROMPT_TOKEN_BUDGET (backend.compact); prompt sizes in prompt_stats
+- Live micro-batching: groups from different wallets share one streamed LLM request (explain_group_stream_batched)
+- Metrics: prompt building, each LLM call and response parsing are timed spans; failed calls are counted (backend.metrics)
 """
 
+import asyncio
+import heapq
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import random
+import re
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 
 import google.generativeai as genai
 import httpx
 
+from backend.compact import compact_group, compact_tx, data_budget, estimate_tokens
+from backend.metrics import LLM_ERRORS, LLM_WAIT_SECONDS, observe, span, timed
+
 log = logging.getLogger("solana_tx_plain")
 
 SECTION_LABELS = ("SUMMARY", "INTENT", "WALLET_IMPACT", "FEES", "PROGRAMS_USED", "RISK", "EXPLANATION")
@@ -29,11 +42,305 @@ SECTION_KEYS = {
 }
 
 
-def get_explanation(parsed: dict[str, Any], simple_mode: bool = True) -> dict[str, Any]:
+OPENROUTER_URL = os.environ.get("OPENROUTER_URL") or "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_TIMEOUT_SEC = 60.0
+# Fraction of /explain requests that also get an OpenRouter cross-check (0 = only when asked for).
+CROSSCHECK_SAMPLE_RATE = float(os.environ.get("OPENROUTER_CROSSCHECK_RATE") or 0)
+
+# Rate limits per provider (0 = unlimited, the default): opt in via .env to match the account's quota.
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM") or 0)
+GEMINI_TPM = float(os.environ.get("GEMINI_TPM") or 0)
+OPENROUTER_RPM = float(os.environ.get("OPENROUTER_RPM") or 0)
+OPENROUTER_TPM = float(os.environ.get("OPENROUTER_TPM") or 0)
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES") or 3)  # consecutive failures that trip it
+LLM_BREAKER_RESET_SEC = float(os.environ.get("LLM_BREAKER_RESET_SEC") or 30)
+LLM_OUTPUT_TOKENS = 800  # expected completion size, counted against tokens/min up front
+PRIORITY_INTERACTIVE = 0  # /explain
+PRIORITY_BACKGROUND = 1  # live group explanations
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+MAX_QUEUE_WAIT_SEC = {PRIORITY_INTERACTIVE: 20.0, PRIORITY_BACKGROUND: 60.0}
+# Live groups from different wallets flushed within this window share one LLM request (max groups per request).
+LIVE_BATCH_WINDOW_SEC = float(os.environ.get("LIVE_BATCH_WINDOW_MS") or 300) / 1000
+LIVE_BATCH_MAX_GROUPS = int(os.environ.get("LIVE_BATCH_MAX_GROUPS") or 4)
+
+_openrouter_http: httpx.AsyncClient | None = None
+_gemini_configured_key: str | None = None
+
+
+def _openrouter_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for OpenRouter (closed by close_llm_clients on app shutdown)."""
+    global _openrouter_http
+    if _openrouter_http is None or _openrouter_http.is_closed:
+        _openrouter_http = httpx.AsyncClient(
+            timeout=OPENROUTER_TIMEOUT_SEC,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _openrouter_http
+
+
+async def close_llm_clients() -> None:
+    global _openrouter_http
+    if _openrouter_http is not None:
+        await _openrouter_http.aclose()
+        _openrouter_http = None
+
+
+# —— LLM dispatch: token buckets, circuit breaker, priority queues ——
+class LLMQueueTimeout(Exception):
+    """Waited longer than MAX_QUEUE_WAIT_SEC for rate-limit budget."""
+
+
+class TokenBucket:
+    """Refills per_minute tokens per minute, bursting up to one minute's worth. per_minute <= 0 means unlimited."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, n: float) -> float:
+        """Seconds until n tokens are available (0 = now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        n = min(n, self.capacity)
+        return 0.0 if self.tokens >= n else (n - self.tokens) / self.rate
+
+    def take(self, n: float) -> None:
+        if self.rate > 0:
+            self.tokens -= min(n, self.capacity)
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive provider failures; after reset_sec lets calls probe again (half-open)."""
+
+    def __init__(self, name: str, failures: int = LLM_BREAKER_FAILURES, reset_sec: float = LLM_BREAKER_RESET_SEC) -> None:
+        self.name = name
+        self.threshold = failures
+        self.reset_sec = reset_sec
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.reset_sec else "half_open"
+
+    def retry_in(self) -> float:
+        return 0.0 if self.opened_at is None else max(0.0, self.reset_sec - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state == "closed":
+                log.warning("%s circuit breaker open for %ss after %s failures", self.name, self.reset_sec, self.failures)
+            self.opened_at = time.monotonic()
+            self.trips += 1
+
+
+class _Provider:
+    def __init__(self, name: str, rpm: float, tpm: float) -> None:
+        self.name = name
+        self.rpm = TokenBucket(rpm)
+        self.tpm = TokenBucket(tpm)
+        self.breaker = CircuitBreaker(name)
+        self.waiters: list[tuple[int, int, asyncio.Future, int]] = []  # heap: (priority, seq, future, tokens)
+        self.timer: asyncio.TimerHandle | None = None
+        self.calls = 0
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls. acquire() waits until the provider's RPM and tokens/min buckets allow
+    the call; waiters are served strictly by priority (interactive before background), FIFO within a priority.
+    """
+
+    def __init__(self) -> None:
+        self.providers = {
+            "gemini": _Provider("Gemini", GEMINI_RPM, GEMINI_TPM),
+            "openrouter": _Provider("OpenRouter", OPENROUTER_RPM, OPENROUTER_TPM),
+        }
+        self._seq = 0
+        self.wait_stats = {name: {"count": 0, "total_sec": 0.0, "max_sec": 0.0} for name in PRIORITY_NAMES.values()}
+
+    async def acquire(self, provider: str, tokens: int, priority: int = PRIORITY_INTERACTIVE) -> None:
+        p = self.providers[provider]
+        fut = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(p.waiters, (priority, self._seq, fut, tokens))
+        start = time.monotonic()
+        self._pump(p)
+        try:
+            await asyncio.wait_for(fut, MAX_QUEUE_WAIT_SEC.get(priority, 60.0))
+        except asyncio.TimeoutError:
+            raise LLMQueueTimeout(f"{p.name} quota: waited over {MAX_QUEUE_WAIT_SEC.get(priority, 60.0):.0f}s for rate limit") from None
+        finally:
+            self._pump(p)  # drop our entry if we timed out / were cancelled
+        waited = time.monotonic() - start
+        LLM_WAIT_SECONDS.observe(waited, provider=provider, priority=PRIORITY_NAMES.get(priority, "background"))
+        stats = self.wait_stats[PRIORITY_NAMES.get(priority, "background")]
+        stats["count"] += 1
+        stats["total_sec"] += waited
+        stats["max_sec"] = max(stats["max_sec"], waited)
+
+    def _pump(self, p: _Provider) -> None:
+        while p.waiters:
+            _, _, fut, tokens = p.waiters[0]
+            if fut.done():
+                heapq.heappop(p.waiters)
+                continue
+            delay = max(p.rpm.delay(1), p.tpm.delay(tokens))
+            if delay > 0:
+                if p.timer is None:
+                    p.timer = asyncio.get_running_loop().call_later(delay, self._on_timer, p)
+                return
+            heapq.heappop(p.waiters)
+            p.rpm.take(1)
+            p.tpm.take(tokens)
+            p.calls += 1
+            fut.set_result(None)
+
+    def _on_timer(self, p: _Provider) -> None:
+        p.timer = None
+        self._pump(p)
+
+    def stats(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"wait": self.wait_stats}
+        for key, p in self.providers.items():
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, fut, _ in p.waiters:
+                if not fut.done():
+                    depth[PRIORITY_NAMES.get(priority, "background")] += 1
+            out[key] = {"breaker": p.breaker.state, "breaker_trips": p.breaker.trips, "calls": p.calls, "queue_depth": depth}
+        return out
+
+
+llm_scheduler = LLMScheduler()
+
+# Estimated prompt tokens per prompt kind ("explain", "live_group", "live_batch"), shown in /debug
+prompt_stats: dict[str, dict[str, int]] = {}
+
+
+def _record_prompt(kind: str, prompt: str) -> int:
+    tokens = estimate_tokens(prompt)
+    stats = prompt_stats.setdefault(kind, {"count": 0, "total_tokens": 0, "max_tokens": 0})
+    stats["count"] += 1
+    stats["total_tokens"] += tokens
+    stats["max_tokens"] = max(stats["max_tokens"], tokens)
+    log.debug("%s prompt: ~%s tokens", kind, tokens)
+    return tokens
+
+
+def _is_outage(err: str) -> bool:
+    """Errors that mean the provider is rate-limiting or unhealthy (as opposed to e.g. a safety block)."""
+    e = err.lower()
+    return any(s in e for s in ("429", "quota", "exhausted", "rate limit", "unavailable", "500", "502", "503", "504", "deadline", "timeout", "timed out", "connect"))
+
+
+def _llm_failed(provider: str, err: str) -> None:
+    """Count a failed LLM call for /metrics, by provider and reason (rate_limited | outage | error)."""
+    e = err.lower()
+    if any(s in e for s in ("429", "quota", "exhausted", "rate limit")):
+        reason = "rate_limited"
+    else:
+        reason = "outage" if _is_outage(err) else "error"
+    LLM_ERRORS.inc(provider=provider, reason=reason)
+
+
+async def _admit(provider: str, prompt: str, priority: int) -> str | None:
+    """Pass the breaker and rate limiter for one call. Returns None when admitted, else why the call was skipped."""
+    p = llm_scheduler.providers[provider]
+    if not p.breaker.allow():
+        LLM_ERRORS.inc(provider=provider, reason="circuit_open")
+        return f"{p.name} unavailable (circuit open after repeated failures; retry in {p.breaker.retry_in():.0f}s)"
+    try:
+        await llm_scheduler.acquire(provider, estimate_tokens(prompt) + LLM_OUTPUT_TOKENS, priority)
+    except LLMQueueTimeout as e:
+        LLM_ERRORS.inc(provider=provider, reason="queue_timeout")
+        return str(e)
+    return None
+
+
+def _gemini_model(api_key: str) -> "genai.GenerativeModel":
+    """Configure the Gemini SDK once per key (re-configuring drops its cached clients)."""
+    global _gemini_configured_key
+    if api_key != _gemini_configured_key:
+        genai.configure(api_key=api_key)
+        _gemini_configured_key = api_key
+    return genai.GenerativeModel(os.environ.get("GEMINI_MODEL", "gemini-2.0-flash"))
+
+
+def model_id() -> str:
+    """Identifies which models would answer get_explanation (part of the explanation cache key)."""
+    parts = []
+    if (os.environ.get("GEMINI_API_KEY") or "").strip():
+        parts.append(os.environ.get("GEMINI_MODEL", "gemini-2.0-flash"))
+    if (os.environ.get("OPENROUTER_API_KEY") or "").strip():
+        parts.append("openrouter/" + os.environ.get("OPENROUTER_MODEL", "google/gemini-2.0-flash"))
+    return "+".join(parts) or "none"
+
+
+def crosscheck_model_id() -> str:
+    """Identifies the cross-check model (explanation cache key for get_crosscheck output)."""
+    return "crosscheck/openrouter/" + os.environ.get("OPENROUTER_MODEL", "google/gemini-2.0-flash")
+
+
+def sample_crosscheck() -> bool:
+    """True for the configured fraction of requests that get a cross-check without asking."""
+    return CROSSCHECK_SAMPLE_RATE > 0 and random.random() < CROSSCHECK_SAMPLE_RATE
+
+
+async def _call_gemini(
+    prompt: str, api_key: str, priority: int = PRIORITY_INTERACTIVE
+) -> tuple[str | None, str | None]:
+    """
+    Call Gemini without blocking the event loop, through the LLM scheduler. Returns (text, error_message).
+    If success: (text, None). If failure or skipped (circuit open / rate limit): (None, "reason").
+    """
+    skipped = await _admit("gemini", prompt, priority)
+    if skipped:
+        return None, skipped
+    breaker = llm_scheduler.providers["gemini"].breaker
+    try:
+        with span("llm_gemini"):
+            response = await _gemini_model(api_key).generate_content_async(prompt)
+    except Exception as e:
+        err = str(e)[:300]
+        breaker.record(not _is_outage(err))
+        _llm_failed("gemini", err)
+        return None, err
+    breaker.record(True)
+    if not response.candidates:
+        reason = getattr(response.prompt_feedback, "block_reason", None) or "no content"
+        return None, f"Gemini: {reason}"
+    text = (response.text or "").strip()
+    if not text:
+        return None, "Gemini returned empty response."
+    return text, None
+
+
+async def get_explanation(
+    parsed: dict[str, Any], simple_mode: bool = True, priority: int = PRIORITY_INTERACTIVE
+) -> dict[str, Any]:
     """
-    Call Gemini (and OpenRouter when configured) for explanation.
-    Returns: summary, intent, wallet_impact, fees, risk_flags, explanation, sections.
-    When OPENROUTER_API_KEY is set, also returns openrouter_* for cross-check display.
+    Explain with Gemini; OpenRouter answers instead when Gemini fails (e.g. 429) or its circuit breaker is open.
+    Returns: summary, intent, wallet_impact, fees, risk_flags, explanation, sections, provider, prompt_tokens.
+    The OpenRouter cross-check is separate (get_crosscheck), so it only costs a call when someone wants it.
     On error: { "error": "...", "message": "..." }.
     """
     gemini_key = (os.environ.get("GEMINI_API_KEY") or "").strip()
@@ -41,83 +348,57 @@ def get_explanation(parsed: dict[str, Any], simple_mode: bool = True) -> dict[st
     if not gemini_key and not openrouter_key:
         return _fallback("Set GEMINI_API_KEY or OPENROUTER_API_KEY in .env.")
     prompt = _build_prompt(parsed, simple_mode)
+    prompt_tokens = _record_prompt("explain", prompt)
 
-    gemini_result: dict[str, Any] | None = None
-    openrouter_result: dict[str, Any] | None = None
-    gemini_error: str | None = None
-    openrouter_error: str | None = None
-
-    def run_gemini() -> tuple[dict[str, Any] | None, str | None]:
-        if not gemini_key:
-            return None, None
-        try:
-            genai.configure(api_key=gemini_key)
-            model_name = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash")
-            model = genai.GenerativeModel(model_name)
-            response = model.generate_content(prompt)
-            if not response.candidates:
-                reason = getattr(response.prompt_feedback, "block_reason", None) or "no content"
-                return None, f"Gemini: {reason}"
-            text = (response.text or "").strip()
-            if not text:
-                return None, "Gemini returned empty response."
+    gemini_error = openrouter_error = None
+    if gemini_key:
+        text, gemini_error = await _call_gemini(prompt, gemini_key, priority)
+        if text is not None:
             out = _parse_response(text)
             _add_risk_flags(out)
-            return out, None
-        except Exception as e:
-            return None, str(e)[:300]
-
-    def run_openrouter() -> tuple[dict[str, Any] | None, str | None]:
-        if not openrouter_key:
-            return None, None
-        result, err = _call_openrouter(prompt)
+            out["provider"] = "gemini"
+            out["prompt_tokens"] = prompt_tokens
+            return out
+    if openrouter_key:
+        if gemini_key:
+            log.info("Gemini failed (%s); using OpenRouter", (gemini_error or "")[:100])
+        result, openrouter_error = await _call_openrouter(prompt, priority)
         if result:
             _add_risk_flags(result)
-            return result, None
-        return None, err or "OpenRouter failed"
+            result["provider"] = "openrouter"
+            result["prompt_tokens"] = prompt_tokens
+            return result
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        futures = {}
-        if gemini_key:
-            futures["gemini"] = executor.submit(run_gemini)
-        if openrouter_key:
-            futures["openrouter"] = executor.submit(run_openrouter)
-        future_to_name = {fut: name for name, fut in futures.items()}
-        for fut in as_completed(futures.values()):
-            name = future_to_name[fut]
-            try:
-                res, err = fut.result()
-                if name == "gemini":
-                    gemini_result, gemini_error = res, err
-                else:
-                    openrouter_result, openrouter_error = res, err
-            except Exception as e:
-                if name == "gemini":
-                    gemini_error = str(e)[:300]
-                else:
-                    openrouter_error = str(e)[:300]
-
-    # Primary: prefer Gemini; if Gemini failed (e.g. 429), use OpenRouter as fallback
-    primary = gemini_result or openrouter_result
-    if not primary:
-        msg = gemini_error or openrouter_error or "No explanation generated."
-        if "429" in msg or "quota" in msg.lower():
-            return {"error": "quota", "message": msg}
-        return {"error": "gemini", "message": msg}
-
-    # Attach OpenRouter cross-check when we have both
-    if gemini_result and openrouter_result:
-        primary["openrouter_summary"] = openrouter_result.get("summary")
-        primary["openrouter_explanation"] = openrouter_result.get("explanation")
-        primary["openrouter_intent"] = openrouter_result.get("intent")
-        primary["openrouter_risk"] = openrouter_result.get("risk")
-        primary["openrouter_sections"] = openrouter_result.get("sections", {})
-        log.info("Gemini + OpenRouter cross-check attached")
-    elif openrouter_result and not gemini_result:
-        primary["openrouter_summary"] = None
-        primary["openrouter_explanation"] = None
-
-    return primary
+    msg = gemini_error or openrouter_error or "No explanation generated."
+    if "429" in msg or "quota" in msg.lower():
+        return {"error": "quota", "message": msg}
+    return {"error": "gemini", "message": msg}
+
+
+async def get_crosscheck(
+    parsed: dict[str, Any], simple_mode: bool = True, priority: int = PRIORITY_INTERACTIVE
+) -> dict[str, Any]:
+    """
+    OpenRouter's explanation of the same tx, to compare with the primary one.
+    Returns openrouter_summary, openrouter_explanation, openrouter_intent, openrouter_risk, openrouter_sections.
+    On error: { "error": "...", "message": "..." }.
+    """
+    if not (os.environ.get("OPENROUTER_API_KEY") or "").strip():
+        return {"error": "not_configured", "message": "OPENROUTER_API_KEY not set."}
+    prompt = _build_prompt(parsed, simple_mode)
+    _record_prompt("crosscheck", prompt)
+    result, err = await _call_openrouter(prompt, priority)
+    if not result:
+        msg = err or "OpenRouter failed"
+        return {"error": "quota" if "429" in msg or "quota" in msg.lower() else "openrouter", "message": msg}
+    log.info("OpenRouter cross-check computed")
+    return {
+        "openrouter_summary": result.get("summary"),
+        "openrouter_explanation": result.get("explanation"),
+        "openrouter_intent": result.get("intent"),
+        "openrouter_risk": result.get("risk"),
+        "openrouter_sections": result.get("sections", {}),
+    }
 
 
 def _add_risk_flags(out: dict[str, Any]) -> None:
@@ -140,31 +421,34 @@ LIVE_LABELS = (
     "WHY_MULTIPLE_TXS",  # only when multiple txs
     "EXPLANATION",
 )
+LIVE_KEYS = {**SECTION_KEYS, "WHY_MULTIPLE_TXS": "why_multiple_txs"}
 
 
-def explain_group(transactions: list[dict[str, Any]]) -> dict[str, Any]:
+async def explain_group(
+    transactions: list[dict[str, Any]], priority: int = PRIORITY_BACKGROUND
+) -> dict[str, Any]:
     """
     Explain a group of transactions that occurred within 1–3 seconds (one user action).
     Returns the same shape as single-tx: summary, intent, wallet_impact, fees, programs_used, risk, explanation;
     plus why_multiple_txs when there are multiple transactions.
+    Uses Gemini; OpenRouter (when configured) answers if Gemini fails or its circuit breaker is open.
     """
-    api_key = os.environ.get("GEMINI_API_KEY") or ""
-    if not api_key.strip():
+    api_key = (os.environ.get("GEMINI_API_KEY") or "").strip()
+    openrouter_key = (os.environ.get("OPENROUTER_API_KEY") or "").strip()
+    if not api_key and not openrouter_key:
         return _live_fallback("GEMINI_API_KEY not set.")
-    genai.configure(api_key=api_key.strip())
-    model = genai.GenerativeModel(os.environ.get("GEMINI_MODEL", "gemini-2.0-flash"))
     prompt = _build_live_prompt(transactions)
-    try:
-        response = model.generate_content(prompt)
-        if not response.candidates:
-            return _live_fallback("No content from model.")
-        text = (response.text or "").strip()
-        if not text:
-            return _live_fallback("Empty response.")
-        return _parse_live_response(text)
-    except Exception as e:
-        log.warning("explain_group error: %s", e)
-        return _live_fallback(str(e)[:200])
+    prompt_tokens = _record_prompt("live_group", prompt)
+    text, err = (None, None)
+    if api_key:
+        text, err = await _call_gemini(prompt, api_key, priority)
+    if text is None and openrouter_key:
+        text, or_err = await _openrouter_text(prompt, priority)
+        err = err or or_err
+    if text is None:
+        log.warning("explain_group error: %s", err)
+        return _live_fallback((err or "No content from model.")[:200])
+    return {**_parse_live_response(text), "prompt_tokens": prompt_tokens}
 
 
 def _live_fallback(msg: str) -> dict[str, Any]:
@@ -181,53 +465,60 @@ def _live_fallback(msg: str) -> dict[str, Any]:
     }
 
 
-def _build_live_prompt(transactions: list[dict[str, Any]]) -> str:
-    tx_summaries = []
-    total_fee = 0.0
-    for i, tx in enumerate(transactions[:10]):  # cap for token size
-        t = {k: v for k, v in tx.items() if k not in ("_raw", "log_preview")}
-        t["log_preview"] = (tx.get("log_preview") or "")[:400]
-        total_fee += float(tx.get("fee_paid") or 0)
-        try:
-            tx_summaries.append(f"--- Tx {i+1} ---\n{json.dumps(t, default=str)}")
-        except (TypeError, ValueError):
-            tx_summaries.append(f"--- Tx {i+1} --- (parse error)")
-    blocks = "\n\n".join(tx_summaries)
-    multi = len(transactions) > 1
-    why_section = (
-        "\nWHY_MULTIPLE_TXS: [Why did multiple transactions occur? E.g. 'Solana executed several steps (approve, swap, settle) as separate txs in under 2 seconds.' One or two sentences.]"
-        if multi
-        else ""
-    )
-    return f"""You are explaining a burst of Solana transactions that just happened for one wallet (within 1–3 seconds). Use the same level of detail as a single-transaction explainer: full plain-English so the user fully understands what happened. Your job is to turn this burst into one human-readable story with the same sections as a hash-based explanation.
-
-Reply with exactly these section headers and content. You may use multiple lines per section. Be thorough but clear.
-
-SUMMARY: [Write 2–4 sentences. Describe what this activity did in plain English: who was involved, what moved (SOL or tokens), and what the outcome was. Add context so a non-technical reader fully understands.]
+def _live_sections(why_section: str) -> str:
+    return f"""SUMMARY: [Write 2–4 sentences. Describe what this activity did in plain English: who was involved, what moved (SOL or tokens), and what the outcome was. Add context so a non-technical reader fully understands.]
 INTENT: [Exactly one of: SOL transfer, token swap, NFT mint, liquidity add/remove, staking, contract interaction, token transfer, unknown]
 WALLET_IMPACT: [Describe what changed: SOL and/or token amounts per account. Be clear about sender vs receiver and any token names or amounts.]
 FEES: [What was paid in SOL across these transactions and what it was for (e.g. "~0.0005 SOL total as network fees.").]
 PROGRAMS_USED: [Which on-chain programs or apps were used. Name them in plain English and briefly what they did if relevant.]
 RISK: [One or two sentences: anything risky, unusual, or worth double-checking. If nothing stands out, say "No suspicious activity."]{why_section}
-EXPLANATION: [Write 3–6 sentences (or a short paragraph). Explain what happened step by step in plain English: what the user or contract did, how funds or tokens moved, why the fee or programs were involved, and what the user can infer. If multiple txs occurred, mention that Solana often executes many steps in under a second (fast finality, low fees) and that this is normal.]
+EXPLANATION: [Write 3–6 sentences (or a short paragraph). Explain what happened step by step in plain English: what the user or contract did, how funds or tokens moved, why the fee or programs were involved, and what the user can infer. If multiple txs occurred, mention that Solana often executes many steps in under a second (fast finality, low fees) and that this is normal.]"""
+
+
+_WHY_MULTIPLE = "\nWHY_MULTIPLE_TXS: [Why did multiple transactions occur? E.g. 'Solana executed several steps (approve, swap, settle) as separate txs in under 2 seconds.' One or two sentences.]"
+
+
+@timed("build_prompt")
+def _build_live_prompt(transactions: list[dict[str, Any]]) -> str:
+    multi = len(transactions) > 1
+    why_section = _WHY_MULTIPLE if multi else ""
+    template = f"""You are explaining a burst of Solana transactions that just happened for one wallet (within 1–3 seconds). Use the same level of detail as a single-transaction explainer: full plain-English so the user fully understands what happened. Your job is to turn this burst into one human-readable story with the same sections as a hash-based explanation.
+
+Reply with exactly these section headers and content. You may use multiple lines per section. Be thorough but clear.
+
+{_live_sections(why_section)}
 
-Group of {len(transactions)} transaction(s) (total fee ~{total_fee:.6f} SOL):
-{blocks}
+Group of {len(transactions)} transaction(s) (total fee ~{{total_fee}} SOL):
+{{data}}
 
 Reply with only the sectioned response. Use the exact section labels above. Content for SUMMARY and EXPLANATION should be longer and more detailed."""
+    data, total_fee = compact_group(transactions, data_budget(estimate_tokens(template)))
+    return template.replace("{total_fee}", f"{total_fee:.6f}").replace("{data}", data)
+
+
+@timed("build_prompt")
+def _build_live_batch_prompt(groups: list[list[dict[str, Any]]]) -> str:
+    """One prompt for several independent groups (different wallets); answers are delimited by GROUP headers."""
+    template = f"""You are explaining {len(groups)} separate bursts of Solana transactions. Each group is a different wallet's activity that just happened (within 1–3 seconds); explain every group on its own, never mix details between groups. Use the same level of detail as a single-transaction explainer: full plain-English so the user fully understands what happened.
+
+For each group, in order, first write the line "=== GROUP n ===" (n = the group number), then exactly these section headers and content. Include WHY_MULTIPLE_TXS only for groups with more than one transaction. In the data, P1/M1-style names are aliases defined in that group's Programs/Mints line.
+
+{_live_sections(_WHY_MULTIPLE)}
 
+{{groups}}
 
+Reply with only the sectioned responses, one "=== GROUP n ===" block per group. Use the exact section labels above."""
+    per_group = data_budget(estimate_tokens(template)) // max(1, len(groups))
+    parts = []
+    for n, transactions in enumerate(groups, 1):
+        data, total_fee = compact_group(transactions, per_group)
+        parts.append(f"=== GROUP {n} === ({len(transactions)} transaction(s), total fee ~{total_fee:.6f} SOL)\n{data}")
+    return template.replace("{groups}", "\n\n".join(parts))
+
+
+@timed("parse_response")
 def _parse_live_response(text: str) -> dict[str, Any]:
-    key_map = {
-        "SUMMARY": "summary",
-        "INTENT": "intent",
-        "WALLET_IMPACT": "wallet_impact",
-        "FEES": "fees",
-        "PROGRAMS_USED": "programs_used",
-        "RISK": "risk",
-        "WHY_MULTIPLE_TXS": "why_multiple_txs",
-        "EXPLANATION": "explanation",
-    }
+    key_map = LIVE_KEYS
     out = {
         "summary": "No summary.",
         "intent": "unknown",
@@ -267,19 +558,22 @@ def _parse_live_response(text: str) -> dict[str, Any]:
     return out
 
 
-def _call_openrouter(prompt: str) -> tuple[dict[str, Any] | None, str | None]:
+async def _openrouter_text(prompt: str, priority: int = PRIORITY_INTERACTIVE) -> tuple[str | None, str | None]:
     """
-    Call OpenRouter with the given prompt. Returns (result_dict, error_message).
-    If success: (result, None). If failure: (None, "reason").
+    Call OpenRouter through the LLM scheduler. Returns (text, error_message).
+    If success: (text, None). If failure: (None, "reason").
     """
     api_key = (os.environ.get("OPENROUTER_API_KEY") or "").strip()
     if not api_key:
         return None, None
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    skipped = await _admit("openrouter", prompt, priority)
+    if skipped:
+        return None, skipped
+    breaker = llm_scheduler.providers["openrouter"].breaker
     try:
-        with httpx.Client(timeout=60.0) as client:
-            resp = client.post(
-                url,
+        with span("llm_openrouter"):
+            resp = await _openrouter_client().post(
+                OPENROUTER_URL,
                 json={
                     "model": os.environ.get("OPENROUTER_MODEL", "google/gemini-2.0-flash"),
                     "messages": [{"role": "user", "content": prompt}],
@@ -290,17 +584,32 @@ def _call_openrouter(prompt: str) -> tuple[dict[str, Any] | None, str | None]:
         if resp.status_code != 200:
             err = body.get("error", {}).get("message") or body.get("message") or resp.text[:200] or f"HTTP {resp.status_code}"
             log.warning("OpenRouter HTTP %s: %s", resp.status_code, err)
+            breaker.record(resp.status_code != 429 and resp.status_code < 500)
+            _llm_failed("openrouter", f"HTTP {resp.status_code}")
             return None, f"HTTP {resp.status_code}: {err}"
+        breaker.record(True)
         content = (body.get("choices") or [{}])[0].get("message", {}).get("content") or ""
         if not content.strip():
             return None, "Empty response from OpenRouter"
-        out = _parse_response(content.strip())
-        return out, None
+        return content.strip(), None
     except Exception as e:
         log.warning("OpenRouter failed: %s", e)
+        breaker.record(False)
+        _llm_failed("openrouter", str(e))
         return None, str(e)[:200]
 
 
+async def _call_openrouter(prompt: str, priority: int = PRIORITY_INTERACTIVE) -> tuple[dict[str, Any] | None, str | None]:
+    """
+    Call OpenRouter with the given prompt. Returns (result_dict, error_message).
+    If success: (result, None). If failure: (None, "reason").
+    """
+    text, err = await _openrouter_text(prompt, priority)
+    if text is None:
+        return None, err
+    return _parse_response(text), None
+
+
 def _fallback(msg: str) -> dict[str, Any]:
     return {
         "error": "config",
@@ -312,19 +621,10 @@ def _fallback(msg: str) -> dict[str, Any]:
     }
 
 
+@timed("build_prompt")
 def _build_prompt(parsed: dict[str, Any], simple_mode: bool) -> str:
     mode = "Explain in simple terms for a beginner." if simple_mode else "Include program names and technical routing details."
-    fee = parsed.get("fee_paid", 0)
-    sol = parsed.get("sol_balance_change") or []
-    tokens = parsed.get("token_balance_changes") or []
-    programs = parsed.get("programs_used") or []
-    instruction_types = parsed.get("instruction_types") or []
-    log_preview = (parsed.get("log_preview") or "")[:1000]
-    slot = parsed.get("slot")
-    block_time = parsed.get("block_time")
-    when = f"Slot: {slot}. Block time (Unix): {block_time}." if (slot is not None or block_time is not None) else ""
-
-    return f"""You are a Solana transaction explainer. {mode}
+    template = f"""You are a Solana transaction explainer. {mode}
 
 From the transaction data below, reply with exactly these section headers and content. You may use multiple lines per section; start each section with the header in CAPS followed by a colon, then write the content. Be thorough but clear.
 
@@ -338,18 +638,13 @@ RISK: [One or two sentences: anything risky, unusual, or worth double-checking (
 EXPLANATION: [Write 3–6 sentences (or a short paragraph). Explain what happened step by step in plain English: what the user or contract did, how funds or tokens moved, why the fee or programs were involved, and what the user can infer from this transaction. Go into a bit more detail so the reader really understands.]
 
 Transaction data:
-- Fee (SOL): {fee}
-- SOL balance changes: {sol}
-- Token balance changes: {tokens}
-- Programs: {programs[:10]}
-- Instruction types: {instruction_types[:10]}
-{f"- When: {when}" if when else ""}
-- Log snippet:
-{log_preview}
+{{data}}
 
 Reply with only the sectioned response. Use the exact section labels above. Content for SUMMARY and EXPLANATION should be longer and more detailed than one line."""
+    return template.replace("{data}", compact_tx(parsed, data_budget(estimate_tokens(template))))
 
 
+@timed("parse_response")
 def _parse_response(text: str) -> dict[str, Any]:
     sections = {k: "" for k in SECTION_KEYS.values()}
     sections["summary"] = "No summary."
@@ -399,3 +694,378 @@ def _parse_response(text: str) -> dict[str, Any]:
         "explanation": sections.get("explanation") or sections.get("summary") or "—",
         "risk_flags": [],
     }
+
+
+# —— Streaming: forward LLM output as it arrives, emit each section once its header is closed ——
+class SectionStreamParser:
+    """
+    Incremental version of _parse_response / _parse_live_response.
+    feed(chunk) returns [(key, value), ...] for sections completed so far (a section completes when the
+    next header starts); close() returns the last open section.
+    """
+
+    def __init__(self, labels: tuple[str, ...] = SECTION_LABELS, keys: dict[str, str] = SECTION_KEYS) -> None:
+        self._labels = labels
+        self._keys = keys
+        self._buf = ""
+        self._current: str | None = None
+        self._lines: list[str] = []
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self._buf += chunk
+        done: list[tuple[str, str]] = []
+        while "\n" in self._buf:
+            line, self._buf = self._buf.split("\n", 1)
+            done.extend(self._line(line))
+        return done
+
+    def close(self) -> list[tuple[str, str]]:
+        done = self._line(self._buf) if self._buf else []
+        self._buf = ""
+        done.extend(self._finish())
+        self._current = None
+        return done
+
+    def _finish(self) -> list[tuple[str, str]]:
+        if not self._current:
+            return []
+        val = " ".join(self._lines).strip()
+        self._lines = []
+        return [(self._keys[self._current], val)] if val else []
+
+    def _line(self, line: str) -> list[tuple[str, str]]:
+        line = line.strip()
+        if not line:
+            if self._current:
+                self._lines.append("")
+            return []
+        for label in self._labels:
+            if line.upper().startswith(label + ":"):
+                done = self._finish()
+                self._current = label
+                rest = line[len(label) + 1:].strip()
+                self._lines = [rest] if rest else []
+                return done
+        if self._current:
+            self._lines.append(line)
+        return []
+
+
+async def _stream_gemini(prompt: str, api_key: str) -> AsyncIterator[str]:
+    response = await _gemini_model(api_key).generate_content_async(prompt, stream=True)
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:  # chunk without text parts (e.g. safety block)
+            continue
+        if text:
+            yield text
+
+
+async def _stream_openrouter(prompt: str) -> AsyncIterator[str]:
+    api_key = (os.environ.get("OPENROUTER_API_KEY") or "").strip()
+    async with _openrouter_client().stream(
+        "POST",
+        OPENROUTER_URL,
+        json={
+            "model": os.environ.get("OPENROUTER_MODEL", "google/gemini-2.0-flash"),
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        },
+        headers={"Authorization": f"Bearer {api_key}"},
+    ) as resp:
+        if resp.status_code != 200:
+            body = (await resp.aread()).decode(errors="replace")
+            raise RuntimeError(f"HTTP {resp.status_code}: {body[:200]}")
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                delta = (json.loads(data).get("choices") or [{}])[0].get("delta", {}).get("content")
+            except (ValueError, AttributeError):
+                continue
+            if delta:
+                yield delta
+
+
+async def _stream_llm(prompt: str, priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[str]:
+    """
+    Stream from Gemini; if it is skipped (circuit open / rate limit) or fails before producing any text,
+    stream from OpenRouter instead.
+    """
+    gemini_key = (os.environ.get("GEMINI_API_KEY") or "").strip()
+    openrouter_key = (os.environ.get("OPENROUTER_API_KEY") or "").strip()
+    if not gemini_key and not openrouter_key:
+        raise RuntimeError("Set GEMINI_API_KEY or OPENROUTER_API_KEY in .env.")
+    err = ""
+    if gemini_key:
+        err = await _admit("gemini", prompt, priority) or ""
+    if gemini_key and not err:
+        breaker = llm_scheduler.providers["gemini"].breaker
+        started = False
+        t0 = time.perf_counter()
+        try:
+            async for chunk in _stream_gemini(prompt, gemini_key):
+                started = True
+                yield chunk
+            breaker.record(True)
+            if started:
+                return
+            err = "Gemini returned empty response."
+        except Exception as e:
+            err = str(e)[:300]
+            breaker.record(not _is_outage(err))
+            _llm_failed("gemini", err)
+            if started:
+                raise
+        finally:
+            observe("llm_gemini_stream", time.perf_counter() - t0)
+    if not openrouter_key:
+        raise RuntimeError(err)
+    if err:
+        log.info("Gemini stream unavailable (%s); streaming from OpenRouter", err[:100])
+    skipped = await _admit("openrouter", prompt, priority)
+    if skipped:
+        raise RuntimeError(skipped)
+    breaker = llm_scheduler.providers["openrouter"].breaker
+    t0 = time.perf_counter()
+    try:
+        async for chunk in _stream_openrouter(prompt):
+            yield chunk
+    except Exception as e:
+        breaker.record(not _is_outage(str(e)))
+        _llm_failed("openrouter", str(e))
+        raise
+    finally:
+        observe("llm_openrouter_stream", time.perf_counter() - t0)
+    breaker.record(True)
+
+
+async def stream_explanation(
+    parsed: dict[str, Any], simple_mode: bool = True, priority: int = PRIORITY_INTERACTIVE
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Streaming get_explanation. Yields events:
+      {"type": "delta", "text": ...}  raw LLM output as it arrives
+      {"type": "section", "key": "summary", "value": ...}  each section once complete
+      {"type": "done", "ai": {...}}  same shape as get_explanation (without openrouter_* cross-check)
+      {"type": "error", "error": "quota" | "gemini" | "config", "message": ...}
+    """
+    parser = SectionStreamParser()
+    parts: list[str] = []
+    prompt = _build_prompt(parsed, simple_mode)
+    prompt_tokens = _record_prompt("explain", prompt)
+    try:
+        async for chunk in _stream_llm(prompt, priority):
+            parts.append(chunk)
+            yield {"type": "delta", "text": chunk}
+            for key, value in parser.feed(chunk):
+                yield {"type": "section", "key": key, "value": value}
+    except Exception as e:
+        msg = str(e)[:300]
+        kind = "quota" if ("429" in msg or "quota" in msg.lower()) else "config" if "Set GEMINI_API_KEY" in msg else "gemini"
+        yield {"type": "error", "error": kind, "message": msg}
+        return
+    for key, value in parser.close():
+        yield {"type": "section", "key": key, "value": value}
+    text = "".join(parts).strip()
+    if not text:
+        yield {"type": "error", "error": "gemini", "message": "No explanation generated."}
+        return
+    out = _parse_response(text)
+    _add_risk_flags(out)
+    out["prompt_tokens"] = prompt_tokens
+    yield {"type": "done", "ai": out}
+
+
+async def explain_group_stream(
+    transactions: list[dict[str, Any]], priority: int = PRIORITY_BACKGROUND
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Streaming explain_group. Yields {"type": "section", "key", "value"} as sections complete, then
+    {"type": "done", "explanation": {...}} with the same shape as explain_group (fallback dict on failure).
+    """
+    parser = SectionStreamParser(LIVE_LABELS, LIVE_KEYS)
+    parts: list[str] = []
+    prompt = _build_live_prompt(transactions)
+    prompt_tokens = _record_prompt("live_group", prompt)
+    try:
+        async for chunk in _stream_llm(prompt, priority):
+            parts.append(chunk)
+            for key, value in parser.feed(chunk):
+                yield {"type": "section", "key": key, "value": value}
+    except Exception as e:
+        log.warning("explain_group stream error: %s", e)
+        yield {"type": "done", "explanation": _live_fallback(str(e)[:200])}
+        return
+    for key, value in parser.close():
+        yield {"type": "section", "key": key, "value": value}
+    text = "".join(parts).strip()
+    if not text:
+        yield {"type": "done", "explanation": _live_fallback("Empty response.")}
+        return
+    yield {"type": "done", "explanation": {**_parse_live_response(text), "prompt_tokens": prompt_tokens}}
+
+
+# —— Live activity: micro-batch groups from different wallets into one LLM request ——
+_GROUP_HEADER = re.compile(r"^=+\s*GROUP\s+(\d+)\s*=+", re.IGNORECASE)
+
+
+class _GroupDemux:
+    """Splits a streamed multi-group answer at "=== GROUP n ===" lines and parses each group's sections."""
+
+    def __init__(self, n_groups: int) -> None:
+        self.parsers = [SectionStreamParser(LIVE_LABELS, LIVE_KEYS) for _ in range(n_groups)]
+        self.texts: list[list[str]] = [[] for _ in range(n_groups)]
+        self._current: int | None = None
+        self._buf = ""
+
+    def feed(self, chunk: str) -> list[tuple[int, str, str]]:
+        self._buf += chunk
+        done: list[tuple[int, str, str]] = []
+        while "\n" in self._buf:
+            line, self._buf = self._buf.split("\n", 1)
+            done.extend(self._line(line))
+        return done
+
+    def close(self) -> list[tuple[int, str, str]]:
+        done = self._line(self._buf) if self._buf else []
+        self._buf = ""
+        if self._current is not None:
+            done.extend((self._current, k, v) for k, v in self.parsers[self._current].close())
+        self._current = None
+        return done
+
+    def _line(self, line: str) -> list[tuple[int, str, str]]:
+        m = _GROUP_HEADER.match(line.strip())
+        if m:
+            done = []
+            if self._current is not None:
+                done = [(self._current, k, v) for k, v in self.parsers[self._current].close()]
+            idx = int(m.group(1)) - 1
+            self._current = idx if 0 <= idx < len(self.parsers) else None
+            return done
+        if self._current is None:
+            return []
+        self.texts[self._current].append(line)
+        return [(self._current, k, v) for k, v in self.parsers[self._current].feed(line + "\n")]
+
+
+class LiveGroupBatcher:
+    """
+    Collects live groups for LIVE_BATCH_WINDOW_SEC (or LIVE_BATCH_MAX_GROUPS groups) and explains them with one
+    streamed LLM request, routing each group's section events back to its caller. A lone group, and any group the
+    model left out of a batched answer, goes through explain_group_stream as before. If the batched stream fails,
+    only groups that have not received a section yet are re-explained; the others finish with the sections they
+    already got (never a second, different set).
+    """
+
+    def __init__(self, window_sec: float = LIVE_BATCH_WINDOW_SEC, max_groups: int = LIVE_BATCH_MAX_GROUPS) -> None:
+        self.window_sec = window_sec
+        self.max_groups = max(1, max_groups)
+        self._pending: list[tuple[list[dict[str, Any]], asyncio.Queue]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()  # running batches (the loop only keeps weak references)
+        self.requests = 0
+        self.groups = 0
+
+    async def stream(self, transactions: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+        """Same events as explain_group_stream."""
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (transactions, queue)
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_groups:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window_sec, self._flush)
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["type"] == "done":
+                    return
+        finally:
+            # Caller gone (listener stopped / cancelled) before the batch was sent: don't spend LLM budget on it
+            if any(pending is entry for pending in self._pending):
+                self._pending = [pending for pending in self._pending if pending is not entry]
+                if not self._pending and self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+    def stats(self) -> dict[str, Any]:
+        return {"requests": self.requests, "groups": self.groups, "pending": len(self._pending)}
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[list[dict[str, Any]], asyncio.Queue]]) -> None:
+        self.requests += 1
+        self.groups += len(batch)
+        answered: set[int] = set()
+        try:
+            if len(batch) > 1:
+                answered = await self._run_batched(batch)
+            else:
+                log.debug("Live batch of 1 group; explaining on its own")
+        finally:
+            # Lone groups, groups missing from the batched answer, and failed batches: one request each
+            rest = [(i, txs, q) for i, (txs, q) in enumerate(batch) if i not in answered]
+            if len(batch) > 1 and rest:
+                self.requests += len(rest)
+            await asyncio.gather(*(self._run_single(txs, q) for _, txs, q in rest))
+
+    async def _run_batched(self, batch: list[tuple[list[dict[str, Any]], asyncio.Queue]]) -> set[int]:
+        """Returns the indexes of groups that got an answer (their done event has been sent)."""
+        demux = _GroupDemux(len(batch))
+        prompt = _build_live_batch_prompt([txs for txs, _ in batch])
+        prompt_tokens = _record_prompt("live_batch", prompt)
+        sent: dict[int, dict[str, str]] = {}  # group index -> sections already streamed to its caller
+        try:
+            async for chunk in _stream_llm(prompt, PRIORITY_BACKGROUND):
+                for idx, key, value in demux.feed(chunk):
+                    sent.setdefault(idx, {})[key] = value
+                    batch[idx][1].put_nowait({"type": "section", "key": key, "value": value})
+        except Exception as e:
+            log.warning("Live batch of %s groups failed (%s partly streamed): %s", len(batch), len(sent), e)
+            # Re-running a partly streamed group would send its clients a second, different set of sections
+            for idx, sections in sent.items():
+                batch[idx][1].put_nowait({"type": "done", "explanation": {**_live_fallback(str(e)[:200]), **sections}})
+            return set(sent)
+        for idx, key, value in demux.close():
+            batch[idx][1].put_nowait({"type": "section", "key": key, "value": value})
+        answered = set()
+        for i, (_, queue) in enumerate(batch):
+            text = "\n".join(demux.texts[i]).strip()
+            if text:
+                answered.add(i)
+                # prompt_tokens: this group's share of the batched prompt
+                explanation = {**_parse_live_response(text), "prompt_tokens": prompt_tokens // len(batch)}
+                queue.put_nowait({"type": "done", "explanation": explanation})
+        log.info("Live batch: %s groups in one LLM request (%s answered)", len(batch), len(answered))
+        return answered
+
+    async def _run_single(self, transactions: list[dict[str, Any]], queue: asyncio.Queue) -> None:
+        try:
+            async for event in explain_group_stream(transactions):
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait({"type": "done", "explanation": _live_fallback(str(e)[:200])})
+
+
+live_batcher = LiveGroupBatcher()
+
+
+async def explain_group_stream_batched(transactions: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """explain_group_stream, sharing one LLM request with groups other wallets flush at about the same time."""
+    async for event in live_batcher.stream(transactions):
+        yield event
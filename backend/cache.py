@@ -0,0 +1,205 @@
+"""
+Content-addressed cache for immutable data: confirmed transactions never change, so neither do their explanations.
+- Tier 1: in-process LRU with max size + TTL eviction.
+- Tier 2 (optional): on-disk SQLite store, enabled by setting TX_CACHE_DB to a file path.
+- SingleFlight: concurrent misses for the same key share one in-flight fetch / LLM call.
+Keys: (network, signature) for raw RPC results; (network, signature, simple_mode, model) for get_explanation output
+(stored with the tx fields the /explain response needs, so a hit skips the RPC as well);
+(structural fingerprint, simple_mode, model) for templated explanations (backend.template_cache).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+log = logging.getLogger("solana_tx_plain")
+
+TX_CACHE_DB = (os.environ.get("TX_CACHE_DB") or "").strip()
+TX_CACHE_MAX_ITEMS = int(os.environ.get("TX_CACHE_MAX_ITEMS") or 2000)
+EXPLANATION_CACHE_MAX_ITEMS = int(os.environ.get("EXPLANATION_CACHE_MAX_ITEMS") or 5000)
+EXPLANATION_CACHE_TTL_SEC = float(os.environ.get("EXPLANATION_CACHE_TTL_SEC") or 6 * 3600)
+# Confirmed txs never change: no reason to expire them before their explanations.
+TX_CACHE_TTL_SEC = float(os.environ.get("TX_CACHE_TTL_SEC") or EXPLANATION_CACHE_TTL_SEC)
+TEMPLATE_CACHE_MAX_ITEMS = int(os.environ.get("TEMPLATE_CACHE_MAX_ITEMS") or 1000)
+# Disk entries outlive process restarts; 0 = keep forever (txs are immutable).
+DISK_CACHE_TTL_SEC = float(os.environ.get("DISK_CACHE_TTL_SEC") or 0)
+
+
+def tx_key(network: str, signature: str) -> str:
+    return f"{network}:{signature}"
+
+
+def explanation_key(network: str, signature: str, simple_mode: bool, model: str) -> str:
+    return f"{network}:{signature}:{'simple' if simple_mode else 'technical'}:{model}"
+
+
+def template_key(fingerprint: str, simple_mode: bool, model: str) -> str:
+    return f"{fingerprint}:{'simple' if simple_mode else 'technical'}:{model}"
+
+
+class LRUCache:
+    """In-process LRU with per-entry TTL. Not thread-safe (used from the event loop only)."""
+
+    def __init__(self, max_items: int, ttl_sec: float) -> None:
+        self.max_items = max_items
+        self.ttl_sec = ttl_sec
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires and expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires = time.monotonic() + self.ttl_sec if self.ttl_sec > 0 else 0.0
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteStore:
+    """Tiny key/value table in SQLite; values are JSON. Calls are blocking — wrap with asyncio.to_thread."""
+
+    def __init__(self, path: str, table: str, ttl_sec: float = 0) -> None:
+        self.table = table
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self.ttl_sec > 0 and created + self.ttl_sec < time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        data = json.dumps(value, default=str)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)",
+                (key, data, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """Memory LRU in front of an optional SQLite store. get() returns (value, tier) with tier "memory" | "disk" | "miss"."""
+
+    def __init__(self, name: str, max_items: int, ttl_sec: float, db_path: str = "") -> None:
+        self.name = name
+        self.memory = LRUCache(max_items, ttl_sec)
+        self.disk: SqliteStore | None = None
+        if db_path:
+            try:
+                self.disk = SqliteStore(db_path, f"{name}_cache", ttl_sec=DISK_CACHE_TTL_SEC)
+            except sqlite3.Error as e:
+                log.warning("%s cache: SQLite store disabled (%s)", name, e)
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    async def get(self, key: str, *, count_miss: bool = True) -> tuple[Any | None, str]:
+        """count_miss=False: an opportunistic lookup that a counted get() follows on a miss."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits["memory"] += 1
+            return value, "memory"
+        if self.disk is not None:
+            try:
+                value = await asyncio.to_thread(self.disk.get, key)
+            except (sqlite3.Error, ValueError) as e:
+                log.warning("%s cache disk read failed: %s", self.name, e)
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+                self.hits["disk"] += 1
+                return value, "disk"
+        if count_miss:
+            self.misses += 1
+        return None, "miss"
+
+    async def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                log.warning("%s cache disk write failed: %s", self.name, e)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing: the first caller for a key starts the work, later callers await the same task.
+    The work runs as its own task, so a disconnecting caller does not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run fn() once per key at a time. Returns (result, shared) where shared is True for coalesced callers."""
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task), shared
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; waiters already received it
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+tx_cache = TieredCache("tx", TX_CACHE_MAX_ITEMS, TX_CACHE_TTL_SEC, TX_CACHE_DB)
+explanation_cache = TieredCache("explanation", EXPLANATION_CACHE_MAX_ITEMS, EXPLANATION_CACHE_TTL_SEC, TX_CACHE_DB)
+template_cache = TieredCache("template", TEMPLATE_CACHE_MAX_ITEMS, EXPLANATION_CACHE_TTL_SEC, TX_CACHE_DB)
+
+tx_flights = SingleFlight()
+explanation_flights = SingleFlight()
+
+
+def close_caches() -> None:
+    tx_cache.close()
+    explanation_cache.close()
+    template_cache.close()
@@ -0,0 +1,173 @@
+"""
+Compact transaction data for LLM prompts (ai_explain._build_prompt / _build_live_prompt).
+Parsed txs are rendered as short tabular lines instead of JSON / Python reprs: programs and mints repeated
+across a group get a short alias (P1, M1) defined once, logs are reduced to program invocations, instruction
+names and errors, and the whole data block is trimmed to a token budget (least important lines first).
+"""
+
+import os
+import re
+from typing import Any
+
+from backend.rules import PROGRAM_NAMES
+
+# Upper bound for a whole prompt (instructions + data); the data block gets what the instructions leave.
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET") or 3000)
+MIN_DATA_TOKENS = 300
+LOG_LINES_PER_TX = 12
+MAX_ROWS_PER_TX = 8  # SOL / token balance rows per tx before "+N more"
+
+_INVOKE = re.compile(r"^Program (\S+) invoke \[(\d+)\]")
+_INSTRUCTION = re.compile(r"^Program log: Instruction: (.+)")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _num(x: Any) -> str:
+    try:
+        return f"{float(x):.9f}".rstrip("0").rstrip(".") or "0"
+    except (TypeError, ValueError):
+        return str(x)
+
+
+def _signed(x: Any) -> str:
+    s = _num(x)
+    return s if s.startswith("-") or s == "0" else "+" + s
+
+
+class _Aliases:
+    """Short names for programs / mints repeated across a group (P1, M1, ...), listed once in a legend."""
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.names: dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        if value not in self.names:
+            self.names[value] = f"{self.prefix}{len(self.names) + 1}"
+        return self.names[value]
+
+    def legend(self, describe: dict[str, str] | None = None) -> str:
+        describe = describe or {}
+        return "; ".join(
+            f"{alias}={value}" + (f" ({describe[value]})" if value in describe else "") for value, alias in self.names.items()
+        )
+
+
+def summarize_logs(log_text: str, program_alias=None, max_lines: int = LOG_LINES_PER_TX) -> list[str]:
+    """Keep only program invocations, `Instruction: X` lines and errors; drop compute/success/data noise."""
+    alias = program_alias or (lambda p: p)
+    out: list[str] = []
+    for line in (log_text or "").split("\n"):
+        line = line.strip()
+        m = _INVOKE.match(line)
+        if m:
+            entry = f"{alias(m.group(1))} invoke" + (f" (depth {m.group(2)})" if m.group(2) != "1" else "")
+        elif (m := _INSTRUCTION.match(line)):
+            entry = f"ix {m.group(1)[:60]}"
+        elif "error" in line.lower() or "failed" in line.lower():
+            entry = line[:160]
+        else:
+            continue
+        if not out or out[-1] != entry:
+            out.append(entry)
+    if len(out) > max_lines:
+        out = out[:max_lines] + [f"... {len(out) - max_lines} more log lines"]
+    return out
+
+
+def _rows(items: list[str], limit: int = MAX_ROWS_PER_TX) -> str:
+    if len(items) > limit:
+        items = items[:limit] + [f"+{len(items) - limit} more"]
+    return ", ".join(items) or "none"
+
+
+def _sol_rows(parsed: dict[str, Any]) -> list[str]:
+    return [
+        f"{c.get('account')} {_num(c.get('before_sol'))}→{_num(c.get('after_sol'))} ({_signed(c.get('change_sol'))})"
+        for c in parsed.get("sol_balance_change") or []
+    ]
+
+
+def _token_rows(parsed: dict[str, Any], mint_alias=None) -> list[str]:
+    alias = mint_alias or (lambda m: m)
+    return [
+        f"{alias(str(t.get('mint')))} {_num(t.get('before'))}→{_num(t.get('after'))} ({_signed(t.get('change'))})"
+        for t in parsed.get("token_balance_changes") or []
+    ]
+
+
+def _instructions(parsed: dict[str, Any]) -> str:
+    counts: dict[str, int] = {}
+    for ix in parsed.get("instruction_types") or []:
+        counts[ix] = counts.get(ix, 0) + 1
+    return ", ".join(f"{ix}×{n}" if n > 1 else ix for ix, n in counts.items()) or "none"
+
+
+def fit_lines(lines: list[str], budget_tokens: int, omitted: str = "... {n} more lines omitted") -> str:
+    """Join lines, dropping trailing ones (least important last) once the token budget is used."""
+    out: list[str] = []
+    used = 0
+    for i, line in enumerate(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens and out:
+            out.append(omitted.format(n=len(lines) - i))
+            break
+        out.append(line)
+        used += cost
+    return "\n".join(out)
+
+
+def compact_tx(parsed: dict[str, Any], budget_tokens: int) -> str:
+    """Data block for one transaction (single-tx prompt)."""
+    programs = parsed.get("programs_used") or []
+    head = [f"Fee: {_num(parsed.get('fee_paid', 0))} SOL"]
+    if parsed.get("slot") is not None or parsed.get("block_time") is not None:
+        head.append(f"Slot: {parsed.get('slot')}. Block time (Unix): {parsed.get('block_time')}.")
+    lines = [
+        " | ".join(head),
+        "Programs: " + _rows([p + (f" ({PROGRAM_NAMES[p]})" if p in PROGRAM_NAMES else "") for p in programs], 10),
+        f"Instructions: {_instructions(parsed)}",
+        "SOL changes (account before→after (change)): " + _rows(_sol_rows(parsed), 20),
+        "Token changes (mint before→after (change)): " + _rows(_token_rows(parsed), 20),
+    ]
+    logs = summarize_logs(parsed.get("log_preview") or "", max_lines=LOG_LINES_PER_TX * 2)
+    if logs:
+        lines.append("Logs (invocations, instructions, errors):")
+        lines.extend("  " + line for line in logs)
+    return fit_lines(lines, budget_tokens)
+
+
+def compact_group(transactions: list[dict[str, Any]], budget_tokens: int, max_txs: int = 10) -> tuple[str, float]:
+    """
+    Data block for a burst of txs: one row per tx, programs and mints aliased once for the whole group,
+    then per-tx log summaries while the budget lasts. Returns (block, total_fee of all txs).
+    """
+    total_fee = sum(float(tx.get("fee_paid") or 0) for tx in transactions)
+    programs, mints = _Aliases("P"), _Aliases("M")
+    rows = ["tx | fee SOL | programs | instructions | SOL changes | token changes"]
+    for i, tx in enumerate(transactions[:max_txs], 1):
+        progs = " ".join(programs(p) for p in tx.get("programs_used") or []) or "-"
+        rows.append(
+            f"{i} | {_num(tx.get('fee_paid') or 0)} | {progs} | {_instructions(tx)} | "
+            f"{_rows(_sol_rows(tx))} | {_rows(_token_rows(tx, mints))}"
+        )
+    if len(transactions) > max_txs:
+        rows.append(f"(+{len(transactions) - max_txs} more txs not shown)")
+    log_lines: list[str] = []
+    for i, tx in enumerate(transactions[:max_txs], 1):
+        logs = summarize_logs(tx.get("log_preview") or "", programs)
+        if logs:
+            log_lines.append(f"tx {i} logs: " + "; ".join(logs))
+    legend = [f"Programs: {programs.legend(PROGRAM_NAMES)}"] if programs.names else []
+    if mints.names:
+        legend.append(f"Mints: {mints.legend()}")
+    return fit_lines(legend + rows + log_lines, budget_tokens), total_fee
+
+
+def data_budget(template_tokens: int, budget: int = PROMPT_TOKEN_BUDGET) -> int:
+    """Tokens left for transaction data once the fixed instructions are counted."""
+    return max(MIN_DATA_TOKENS, budget - template_tokens)
@@ -0,0 +1,159 @@
+"""
+Historical wallet backfill (GET /wallet/{address}/history).
+Pages back through getSignaturesForAddress with `before` cursors, fetches each page's transactions with JSON-RPC
+batches, clusters them into bursts by blockTime with the live grouping rules (backend.live_listener.group_deadline),
+and explains up to HISTORY_EXPLAIN_CONCURRENCY bursts at once. Results are yielded as each burst is explained,
+not after the whole range.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+
+from backend.ai_explain import PRIORITY_BACKGROUND, explain_group
+from backend.live_listener import GROUP_MAX_TXS, group_deadline
+from backend.metrics import span
+from backend.parser import parse_tx
+from backend.rules import FAST_PATH_ENABLED, explain_group_simple
+from backend.solana_client import get_signatures_for_address, get_transactions
+
+log = logging.getLogger("solana_tx_plain")
+
+HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE") or 100)  # signatures per getSignaturesForAddress page
+HISTORY_MAX_SIGNATURES = int(os.environ.get("HISTORY_MAX_SIGNATURES") or 1000)  # per request
+HISTORY_EXPLAIN_CONCURRENCY = int(os.environ.get("HISTORY_EXPLAIN_CONCURRENCY") or 4)
+
+
+def _bursts(txs: list[tuple[int | None, str, dict[str, Any]]], carry: list | None = None) -> tuple[list[list], list]:
+    """
+    txs: (block_time, signature, parsed), newest first (RPC order). Walking back in time, a tx joins the current
+    burst while it is within the live grouping rules of it (mirrored: time runs backwards). Returns (closed bursts,
+    open burst) — the open one may continue on the next page, so it is carried over.
+    """
+    closed: list[list] = []
+    current: list = list(carry or [])
+    for item in txs:
+        block_time = item[0]
+        if current and (
+            block_time is None
+            or current[-1][0] is None
+            or len(current) >= GROUP_MAX_TXS
+            or -block_time > group_deadline(-current[0][0], -current[-1][0])
+        ):
+            closed.append(current)
+            current = []
+        current.append(item)
+    return closed, current
+
+
+async def _explain_burst(index: int, burst: list, explain: bool) -> dict[str, Any]:
+    chronological = list(reversed(burst))
+    tx_list = [p for _, _, p in chronological]
+    times = [t for t, _, _ in chronological if t is not None]
+    event: dict[str, Any] = {
+        "type": "group",
+        "index": index,
+        "signatures": [s for _, s, _ in chronological],
+        "count": len(chronological),
+        "block_time_start": times[0] if times else None,
+        "block_time_end": times[-1] if times else None,
+    }
+    if explain:
+        explanation = explain_group_simple(tx_list) if FAST_PATH_ENABLED else None
+        explainer = "rules"
+        if explanation is None:
+            explainer = "llm"
+            explanation = await explain_group(tx_list, priority=PRIORITY_BACKGROUND)
+        event["explanation"] = explanation
+        event["explainer"] = explainer
+    return event
+
+
+async def wallet_history(
+    address: str,
+    network: str = "mainnet",
+    *,
+    limit: int = 100,
+    before: str | None = None,
+    explain: bool = True,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yields, as they become available:
+      {"type": "group", "index", "signatures", "count", "block_time_start", "block_time_end", "explanation", "explainer"}
+        (groups are numbered newest first; they may complete out of order)
+      {"type": "progress", "scanned": N, "cursor": oldest signature so far}  after each page
+      {"type": "done", "scanned": N, "groups": N, "cursor": ...}  (pass cursor as `before` to continue)
+      {"type": "error", "message": ...}  per group, or (with "scanned", "groups", "cursor") when paging failed:
+        groups from the pages read so far are still explained first, so `before=cursor` resumes without gaps
+    """
+    limit = max(1, min(limit, HISTORY_MAX_SIGNATURES))
+    out: asyncio.Queue = asyncio.Queue()
+    sem = asyncio.Semaphore(max(1, HISTORY_EXPLAIN_CONCURRENCY))
+    workers: set[asyncio.Task] = set()
+    done_marker = object()
+
+    async def explain_one(index: int, burst: list) -> None:
+        async with sem:
+            try:
+                await out.put(await _explain_burst(index, burst, explain))
+            except Exception as e:
+                log.warning("History explain failed for group %s: %s", index, e)
+                await out.put({"type": "error", "index": index, "message": str(e)[:200]})
+
+    def start(burst: list) -> None:
+        task = asyncio.create_task(explain_one(len(workers), burst))
+        workers.add(task)
+
+    async def produce() -> None:
+        scanned = 0
+        cursor = before
+        carry: list = []
+        try:
+            while scanned < limit:
+                want = min(HISTORY_PAGE_SIZE, limit - scanned)
+                page = await get_signatures_for_address(address, network=network, limit=want, before=cursor)
+                if not page:
+                    break
+                items = [item for item in page if item.get("signature")]
+                raws = await get_transactions([item["signature"] for item in items], network=network)
+                txs = []
+                for item, raw in zip(items, raws):
+                    if raw:
+                        with span("parse_tx"):
+                            parsed = parse_tx(raw)
+                        parsed["signature"] = item.get("signature")
+                        txs.append((item.get("blockTime") or raw.get("blockTime"), item.get("signature"), parsed))
+                closed, carry = _bursts(txs, carry)
+                for burst in closed:
+                    start(burst)
+                scanned += len(page)
+                cursor = page[-1].get("signature")
+                await out.put({"type": "progress", "scanned": scanned, "cursor": cursor})
+                if len(page) < want:
+                    break
+            if carry:
+                start(carry)
+            await asyncio.gather(*workers)
+            await out.put({"type": "done", "scanned": scanned, "groups": len(workers), "cursor": cursor})
+        except Exception as e:
+            log.warning("History for %s... failed: %s", address[:12], e)
+            if carry:
+                start(carry)
+            await asyncio.gather(*workers, return_exceptions=True)
+            await out.put({"type": "error", "message": str(e)[:200], "scanned": scanned, "groups": len(workers), "cursor": cursor})
+        finally:
+            await out.put(done_marker)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            event = await out.get()
+            if event is done_marker:
+                return
+            yield event
+    finally:
+        producer.cancel()
+        for task in workers:
+            task.cancel()
@@ -0,0 +1,249 @@
+"""
+Per-process subscription hub for live activity.
+One run_listener per (network, wallet), shared by every SSE client watching that wallet:
+each event is serialized once into an SSE frame (with an `id:`) and handed to every client's queue.
+- Slow clients: a full client queue applies LIVE_SLOW_CLIENT_POLICY (drop_oldest | coalesce | disconnect).
+- Replay: the last LIVE_REPLAY_SIZE frames are kept, so a client reconnecting with Last-Event-ID resumes
+  where it left off instead of missing events (no AI work is redone). Replayed frames are delivered in full,
+  on top of the client queue size: the slow-client policy only applies to live frames.
+- The listener lingers LIVE_LINGER_SEC after the last client leaves, so quick reconnects keep it (and its replay ring).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any
+
+from backend.live_listener import run_listener
+
+log = logging.getLogger("solana_tx_plain")
+
+CLIENT_QUEUE_SIZE = int(os.environ.get("LIVE_CLIENT_QUEUE_SIZE") or 64)
+SLOW_CLIENT_POLICY = (os.environ.get("LIVE_SLOW_CLIENT_POLICY") or "coalesce").strip().lower()
+REPLAY_SIZE = int(os.environ.get("LIVE_REPLAY_SIZE") or 100)
+LINGER_SEC = float(os.environ.get("LIVE_LINGER_SEC") or 15)
+PREVIEW_TYPES = ("activity_detected", "activity_section")  # superseded by the final "activity" event
+
+
+class Frame:
+    """One event, serialized once for all clients."""
+
+    __slots__ = ("seq", "type", "data")
+
+    def __init__(self, seq: int, event_type: str, data: str) -> None:
+        self.seq = seq
+        self.type = event_type
+        self.data = data
+
+
+def _payload(event: dict[str, Any], network: str) -> dict[str, Any]:
+    """Client-facing shape of a run_listener event."""
+    if event.get("type") == "activity_section":
+        section = {k: event.get(k) for k in ("type", "signatures", "wallet", "key", "value")}
+        return {**section, "network": network}
+    payload = {
+        "type": event.get("type"),
+        "signatures": event.get("signatures", []),
+        "count": event.get("count", 0),
+        "wallet": event.get("wallet", ""),
+        "explanation": event.get("explanation", {}),
+        "explainer": event.get("explainer"),
+        "just_happened": event.get("just_happened", False),
+        "network": network,
+    }
+    if event.get("dropped"):
+        payload["dropped"] = event["dropped"]
+    return payload
+
+
+class ClientQueue:
+    """Bounded frame queue for one SSE client, applying the slow-client policy instead of silently dropping."""
+
+    def __init__(self, sections: bool, maxsize: int = CLIENT_QUEUE_SIZE, policy: str = SLOW_CLIENT_POLICY) -> None:
+        self.sections = sections  # client asked for activity_section frames (&stream=1)
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.frames: deque[Frame] = deque()
+        self.closed = False  # set by the disconnect policy; the SSE response ends and the client reconnects
+        self.dropped = 0
+        self.backlog = 0  # replayed frames still queued; they don't count against maxsize
+        self._ready = asyncio.Event()
+
+    def wants(self, frame: Frame) -> bool:
+        return self.sections or frame.type != "activity_section"
+
+    def preload(self, frames: list[Frame]) -> None:
+        """Replayed frames: queued as a whole, never subject to the slow-client policy."""
+        self.frames.extend(frames)
+        self.backlog += len(frames)
+        if frames:
+            self._ready.set()
+
+    def put(self, frame: Frame) -> None:
+        if self.closed or not self.wants(frame):
+            return
+        if len(self.frames) >= self.maxsize + self.backlog:
+            if self.policy == "disconnect":
+                self.closed = True
+                self._ready.set()
+                return
+            if self.policy == "coalesce":
+                # Previews (activity_detected / activity_section) are superseded by the activity event that follows
+                kept = deque(f for f in self.frames if f.type not in PREVIEW_TYPES)
+                self.dropped += len(self.frames) - len(kept)
+                self.frames = kept
+            while len(self.frames) >= self.maxsize + self.backlog:
+                self.frames.popleft()
+                self.dropped += 1
+            self.backlog = min(self.backlog, len(self.frames))
+        self.frames.append(frame)
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Frame | None:
+        """Next frame, or None on timeout or when closed."""
+        if not self.frames and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.closed or not self.frames:
+            return None
+        self.backlog = max(0, self.backlog - 1)
+        return self.frames.popleft()
+
+
+class _Fanout:
+    """Queue-like sink handed to run_listener; put_nowait serializes each event once and copies it to every client."""
+
+    def __init__(self, network: str) -> None:
+        self.network = network
+        self.epoch = str(int(time.time() * 1000))  # ids of a new listener never collide with an old one's
+        self.seq = 0
+        self.ring: deque[Frame] = deque(maxlen=REPLAY_SIZE)
+        self.clients: set[ClientQueue] = set()
+        self.dropped = 0
+        self.disconnected = 0
+
+    def put_nowait(self, event: dict[str, Any]) -> None:
+        self.seq += 1
+        data = json.dumps(_payload(event, self.network))
+        frame = Frame(self.seq, event.get("type") or "", f"id: {self.epoch}-{self.seq}\ndata: {data}\n\n")
+        self.ring.append(frame)
+        for client in list(self.clients):
+            before = client.dropped, client.closed
+            client.put(frame)
+            self.dropped += client.dropped - before[0]
+            if client.closed and not before[1]:
+                self.disconnected += 1
+                log.warning("Live client too slow, disconnecting (it can resume with Last-Event-ID)")
+
+    def replay(self, client: ClientQueue, last_event_id: str) -> int:
+        """Queue the frames after last_event_id ("<epoch>-<seq>"). Returns how many were replayed."""
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return 0
+        frames = [f for f in self.ring if f.seq > int(seq) and client.wants(f)]
+        client.preload(frames)
+        return len(frames)
+
+
+class _Subscription:
+    def __init__(self, wallet: str, network: str) -> None:
+        self.fanout = _Fanout(network)
+        self.stop = asyncio.Event()
+        self.task = asyncio.create_task(run_listener(wallet, self.fanout, network=network, stop=self.stop))
+        self.linger: asyncio.TimerHandle | None = None
+
+
+class ListenerHub:
+    """Reference-counts watched wallets; subscribe() returns a ClientQueue fed by the shared listener."""
+
+    def __init__(self) -> None:
+        self._subs: dict[tuple[str, str], _Subscription] = {}
+        self.replayed = 0
+        self.retired = {"dropped_events": 0, "disconnected_clients": 0}  # of stopped listeners (stats stay monotonic)
+        self._tasks: set[asyncio.Task] = set()  # listener stops started by linger timers
+
+    def subscribe(self, wallet: str, network: str, *, sections: bool = False, last_event_id: str = "") -> ClientQueue:
+        key = (network, wallet)
+        sub = self._subs.get(key)
+        if sub is None:
+            sub = _Subscription(wallet, network)
+            self._subs[key] = sub
+            log.info("Hub: started listener for %s... on %s", wallet[:12], network)
+        elif sub.linger is not None:
+            sub.linger.cancel()
+            sub.linger = None
+        client = ClientQueue(sections)
+        if last_event_id:
+            self.replayed += sub.fanout.replay(client, last_event_id)
+        sub.fanout.clients.add(client)
+        return client
+
+    async def unsubscribe(self, wallet: str, network: str, client: ClientQueue) -> None:
+        key = (network, wallet)
+        sub = self._subs.get(key)
+        if sub is None:
+            return
+        sub.fanout.clients.discard(client)
+        if sub.fanout.clients or sub.linger is not None:
+            return
+        if LINGER_SEC > 0:
+            sub.linger = asyncio.get_running_loop().call_later(LINGER_SEC, self._expire, key, sub)
+            return
+        await self._stop(key, sub)
+
+    def _expire(self, key: tuple[str, str], sub: _Subscription) -> None:
+        sub.linger = None
+        if not sub.fanout.clients:
+            task = asyncio.create_task(self._stop(key, sub))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _stop(self, key: tuple[str, str], sub: _Subscription) -> None:
+        if self._subs.get(key) is not sub:
+            return
+        del self._subs[key]
+        self._retire(sub)
+        log.info("Hub: last client left, stopping listener for %s... on %s", key[1][:12], key[0])
+        await _stop(sub)
+
+    async def close(self) -> None:
+        subs = list(self._subs.values())
+        self._subs.clear()
+        for sub in subs:
+            self._retire(sub)
+            if sub.linger is not None:
+                sub.linger.cancel()
+        await asyncio.gather(*(_stop(sub) for sub in subs), return_exceptions=True)
+
+    def _retire(self, sub: _Subscription) -> None:
+        self.retired["dropped_events"] += sub.fanout.dropped
+        self.retired["disconnected_clients"] += sub.fanout.disconnected
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "listeners": len(self._subs),
+            "clients": sum(len(s.fanout.clients) for s in self._subs.values()),
+            "dropped_events": self.retired["dropped_events"] + sum(s.fanout.dropped for s in self._subs.values()),
+            "disconnected_clients": self.retired["disconnected_clients"] + sum(s.fanout.disconnected for s in self._subs.values()),
+            "replayed_events": self.replayed,
+        }
+
+
+async def _stop(sub: _Subscription) -> None:
+    sub.stop.set()
+    sub.task.cancel()
+    try:
+        await sub.task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        log.warning("Hub: listener exited with error: %s", e)
+
+
+hub = ListenerHub()
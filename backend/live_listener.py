@@ -1,31 +1,64 @@
 """
 Live Solana transaction listener and grouper.
-Subscribes to logs for a wallet via WebSocket, fetches txs, groups within 2–3s, explains via AI, emits to SSE.
+Subscribes to logs for a wallet via the shared WebSocket pool, fetches txs, groups bursts (closing on idle gaps, at most 2.5s), explains via AI, emits to SSE.
+Notifications often arrive before the RPC node serves the tx: signatures not yet fetchable are retried in the
+background (jittered exponential backoff, up to a deadline) and join the grouping buffer in slot order.
 """
 
 import asyncio
-import json
+import bisect
 import logging
 import os
+import random
 import time
+from collections.abc import Callable
 from typing import Any
 
-import websockets
-
-from backend.ai_explain import explain_group
+from backend.ai_explain import explain_group_stream_batched
+from backend.metrics import LIVE_DROPPED_TXS, LIVE_FETCH_RETRIES, LIVE_GROUPS, span
 from backend.parser import parse_tx
-from backend.solana_client import get_signatures_for_address, get_transaction
+from backend.poller import poll_scheduler
+from backend.rules import FAST_PATH_ENABLED, explain_group_simple
+from backend.solana_client import get_transaction_batched
+from backend.ws_manager import ws_manager
 
 log = logging.getLogger("solana_tx_plain")
 
-SOLANA_MAINNET_WS = os.environ.get("SOLANA_MAINNET_WS") or "wss://api.mainnet-beta.solana.com"
-SOLANA_DEVNET_WS = os.environ.get("SOLANA_DEVNET_WS") or "wss://api.devnet.solana.com"
-GROUP_WINDOW_SEC = 2.5  # group txs that land within this many seconds
-POLL_INTERVAL_SEC = 2.0  # devnet: poll getSignaturesForAddress every N seconds
+GROUP_WINDOW_SEC = 2.5  # max age of a group: flush at most this long after its first tx
+GROUP_IDLE_SEC = float(os.environ.get("LIVE_GROUP_IDLE_SEC") or 1.0)  # flush early after this long with no new tx
+GROUP_MAX_TXS = int(os.environ.get("LIVE_GROUP_MAX_TXS") or 20)  # flush as soon as a group is this big
+BUFFER_MAX_TXS = int(os.environ.get("LIVE_BUFFER_MAX_TXS") or 200)  # per wallet; newer signatures beyond it are dropped
+DROPPED_SIGNATURES_KEPT = 10  # dropped signatures reported with the next activity event
+FETCH_CONCURRENCY = int(os.environ.get("LIVE_FETCH_CONCURRENCY") or 4)  # concurrent getTransaction per wallet
+FETCH_PIPELINE_SIZE = 256  # signatures waiting to be fetched/buffered per wallet
+# getTransaction returns null until the node has the tx: retry after base, 2*base, ... (capped, jittered) until the deadline
+FETCH_RETRY_BASE_SEC = float(os.environ.get("LIVE_FETCH_RETRY_BASE_MS") or 500) / 1000
+FETCH_RETRY_MAX_SEC = float(os.environ.get("LIVE_FETCH_RETRY_MAX_MS") or 4000) / 1000
+FETCH_RETRY_DEADLINE_SEC = float(os.environ.get("LIVE_FETCH_RETRY_DEADLINE_SEC") or 30)
+
+# (network, wallet) -> current number of held txs (waiting for fetch or buffered), for /metrics
+_buffer_sizes: dict[tuple[str, str], Callable[[], int]] = {}
+
+
+def buffer_stats() -> dict[str, int]:
+    sizes = [size() for size in _buffer_sizes.values()]
+    return {"listeners": len(sizes), "held_txs": sum(sizes), "max_held_txs": max(sizes, default=0)}
+
+
+def group_deadline(first: float, last: float, window: float = GROUP_WINDOW_SEC) -> float:
+    """Time at which a group whose txs arrived between first and last closes (idle gap or max age)."""
+    return min(first + window, last + GROUP_IDLE_SEC)
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt (0-based): exponential, capped, with jitter so wallets don't retry in lockstep."""
+    delay = min(FETCH_RETRY_MAX_SEC, FETCH_RETRY_BASE_SEC * 2**attempt)
+    return delay * random.uniform(0.5, 1.0)
 
 
-def _ws_url(network: str) -> str:
-    return SOLANA_DEVNET_WS if (network or "").strip().lower() == "devnet" else SOLANA_MAINNET_WS
+def _slot_key(entry: tuple[str, dict[str, Any], float]) -> float:
+    slot = entry[1].get("slot")
+    return slot if isinstance(slot, int) else float("inf")
 
 
 def _is_devnet(network: str) -> bool:
@@ -33,13 +66,13 @@ def _is_devnet(network: str) -> bool:
 
 
 async def fetch_and_parse(signature: str, network: str = "mainnet") -> tuple[str, dict[str, Any]] | None:
-    """Fetch tx by signature and return (signature, parsed) or None."""
-    raw = await get_transaction(signature, network=network)
+    """Fetch tx by signature and return (signature, parsed) or None. Concurrent fetches share RPC batches."""
+    raw = await get_transaction_batched(signature, network=network)
     if not raw:
         return None
-    parsed = parse_tx(raw)
+    with span("parse_tx"):
+        parsed = parse_tx(raw)
     parsed["signature"] = signature
-    parsed["_raw"] = raw
     return (signature, parsed)
 
 
@@ -49,26 +82,119 @@ async def run_listener(
     *,
     network: str = "mainnet",
     group_seconds: float = GROUP_WINDOW_SEC,
+    fetch_concurrency: int = FETCH_CONCURRENCY,
     stop: asyncio.Event | None = None,
 ) -> None:
     """
     Subscribe to Solana logs for wallet, buffer txs, group by time window, explain via AI, push to out_queue.
-    Each item: {"type": "activity", "signatures": [...], "count": N, "wallet": wallet, "explanation": {...}, "just_happened": True}.
+    Each item: {"type": "activity", "signatures": [...], "count": N, "wallet": wallet, "explanation": {...}, "explainer": "rules"|"llm", "just_happened": True}.
+    While the LLM streams, {"type": "activity_section", "signatures": [...], "key": ..., "value": ...} items arrive first.
+    Receiving and fetching are pipelined: sources only enqueue signatures, up to fetch_concurrency
+    getTransaction calls run at once, and results enter the grouping buffer in slot order. A signature the
+    RPC does not return yet (or whose fetch fails) is retried by its own task with retry_delay() backoff for
+    up to FETCH_RETRY_DEADLINE_SEC, without holding up the signatures behind it.
+    Grouping is event-driven: a group is flushed GROUP_IDLE_SEC after its last tx, group_seconds after its
+    first tx, or as soon as it has GROUP_MAX_TXS txs, whichever comes first. At most BUFFER_MAX_TXS signatures
+    are held per wallet (waiting for fetch or buffered); newer ones are dropped and reported on the next
+    activity event as "dropped": {"count", "signatures"}.
     """
-    buffer: list[tuple[str, dict[str, Any], float]] = []
+    buffer: list[tuple[str, dict[str, Any], float]] = []  # (signature, parsed, arrival time)
     stop = stop or asyncio.Event()
-    last_flush = time.monotonic()
-    loop = asyncio.get_event_loop()
+    wake = asyncio.Event()  # set when a tx enters the buffer
+    dropped: list[str] = []
+    dropped_count = 0
+    fetch_sem = asyncio.Semaphore(max(1, fetch_concurrency))
+    pipeline: asyncio.Queue = asyncio.Queue(maxsize=FETCH_PIPELINE_SIZE)
+    retrying: set[asyncio.Task] = set()
+
+    async def fetch_limited(sig: str) -> tuple[str, dict[str, Any]] | None:
+        async with fetch_sem:
+            return await fetch_and_parse(sig, network=network)
+
+    async def enqueue_fetch(sig: str) -> None:
+        """Start fetching sig now; buffer_loop picks up the result in arrival order."""
+        await pipeline.put((sig, asyncio.create_task(fetch_limited(sig))))
+
+    def add(sig: str, parsed: dict[str, Any]) -> None:
+        """Into the grouping buffer, after every buffered tx of the same or an earlier slot."""
+        bisect.insort(buffer, (sig, parsed, time.monotonic()), key=_slot_key)
+        wake.set()
+        log.info("Buffered tx %s (buffer size %s)", sig[:16], len(buffer))
+
+    async def retry_fetch(sig: str) -> None:
+        deadline = time.monotonic() + FETCH_RETRY_DEADLINE_SEC
+        attempt = 0
+        while True:
+            delay = retry_delay(attempt)
+            if time.monotonic() + delay > deadline:
+                LIVE_FETCH_RETRIES.inc(outcome="abandoned")
+                log.warning("Tx %s still not fetchable after %s attempts, giving up", sig[:16], attempt + 1)
+                return
+            await asyncio.sleep(delay)
+            attempt += 1
+            try:
+                fetched = await fetch_limited(sig)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.debug("Live listener retry %s for %s failed: %s", attempt, sig[:16], e)
+                continue
+            if fetched:
+                LIVE_FETCH_RETRIES.inc(outcome="resolved")
+                log.info("Tx %s fetched on retry %s", sig[:16], attempt)
+                add(*fetched)
+                return
+
+    def schedule_retry(sig: str) -> None:
+        task = asyncio.create_task(retry_fetch(sig))
+        retrying.add(task)
+        task.add_done_callback(retrying.discard)
+
+    async def buffer_loop() -> None:
+        while True:
+            sig, task = await pipeline.get()
+            try:
+                fetched = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.info("Live listener fetch error for %s (will retry): %s", sig[:16], e)
+                fetched = None
+            if fetched:
+                add(*fetched)
+            else:
+                schedule_retry(sig)
+
+    def held() -> int:
+        return len(buffer) + pipeline.qsize() + len(retrying)
+
+    def accept(sig: str) -> bool:
+        """Memory bound: False (and the signature is recorded as dropped) when the wallet already holds too many txs."""
+        nonlocal dropped_count
+        if held() < BUFFER_MAX_TXS:
+            return True
+        dropped_count += 1
+        LIVE_DROPPED_TXS.inc()
+        if len(dropped) < DROPPED_SIGNATURES_KEPT:
+            dropped.append(sig)
+        if dropped_count == 1:
+            log.warning("Live buffer full for %s... (%s txs), dropping new signatures", wallet[:12], BUFFER_MAX_TXS)
+        return False
 
     async def flush() -> None:
-        nonlocal buffer, last_flush
-        if not buffer:
-            return
-        group = buffer[:]
-        buffer.clear()
-        last_flush = time.monotonic()
+        if buffer:
+            with span("group_flush"):
+                await flush_group()
+
+    async def flush_group() -> None:
+        nonlocal dropped_count
+        group = buffer[:GROUP_MAX_TXS]
+        del buffer[:GROUP_MAX_TXS]
         sigs = [s for s, _, _ in group]
         tx_list = [p for _, p, _ in group]
+        overflow = {"count": dropped_count, "signatures": dropped[:]} if dropped_count else None
+        dropped.clear()
+        dropped_count = 0
         # Instant ping: something happened (before AI runs)
         try:
             out_queue.put_nowait({
@@ -81,145 +207,129 @@ async def run_listener(
         except asyncio.QueueFull:
             pass
         try:
-            explanation = await loop.run_in_executor(None, lambda: explain_group(tx_list))
+            explanation = explain_group_simple(tx_list) if FAST_PATH_ENABLED else None
+            explainer = "rules"
+            if explanation is None:
+                explainer = "llm"
+                # Stream sections to clients as they complete, then send the full activity event.
+                # Groups other wallets flush at about the same time share the LLM request.
+                async for event in explain_group_stream_batched(tx_list):
+                    if event["type"] == "done":
+                        explanation = event["explanation"]
+                        continue
+                    try:
+                        out_queue.put_nowait({
+                            "type": "activity_section",
+                            "signatures": sigs,
+                            "wallet": wallet,
+                            "key": event["key"],
+                            "value": event["value"],
+                        })
+                    except asyncio.QueueFull:
+                        pass
+            LIVE_GROUPS.inc(explainer=explainer)
             out_queue.put_nowait({
                 "type": "activity",
                 "signatures": sigs,
                 "count": len(tx_list),
                 "wallet": wallet,
                 "explanation": explanation,
+                "explainer": explainer,
                 "just_happened": True,
+                **({"dropped": overflow} if overflow else {}),
             })
         except asyncio.QueueFull:
             log.warning("Live out_queue full, dropping activity group")
         except Exception as e:
             log.warning("explain_group failed: %s", e)
-            out_queue.put_nowait({
-                "type": "activity",
-                "signatures": sigs,
-                "count": len(tx_list),
-                "wallet": wallet,
-                "explanation": {"summary": "Explanation failed.", "intent": "unknown", "wallet_impact": "—", "fees": "—", "programs_used": "—", "risk": "No suspicious activity.", "why_multiple_txs": "—", "explanation": str(e)[:200], "error": str(e)[:200]},
-                "just_happened": True,
-            })
+            LIVE_GROUPS.inc(explainer="failed")
+            try:
+                out_queue.put_nowait({
+                    "type": "activity",
+                    "signatures": sigs,
+                    "count": len(tx_list),
+                    "wallet": wallet,
+                    "explanation": {"summary": "Explanation failed.", "intent": "unknown", "wallet_impact": "—", "fees": "—", "programs_used": "—", "risk": "No suspicious activity.", "why_multiple_txs": "—", "explanation": str(e)[:200], "error": str(e)[:200]},
+                    "just_happened": True,
+                })
+            except asyncio.QueueFull:
+                log.warning("Live out_queue full, dropping activity group")
 
-    async def flush_loop() -> None:
+    async def group_loop() -> None:
+        """Flush each group exactly when it closes (idle gap, max age or max size) instead of polling."""
         while not stop.is_set():
-            await asyncio.sleep(0.5)
-            if buffer and (time.monotonic() - last_flush) >= group_seconds:
+            if not buffer:
+                await wake.wait()
+                wake.clear()
+                continue
+            now = time.monotonic()
+            arrivals = [arrived for _, _, arrived in buffer]  # slot order, so not necessarily sorted
+            closes_at = group_deadline(min(arrivals), max(arrivals), group_seconds)
+            if len(buffer) >= GROUP_MAX_TXS or now >= closes_at:
                 await flush()
-
-    async def poll_loop() -> None:
-        """Devnet: poll getSignaturesForAddress every N seconds (public devnet WS often doesn't deliver logsSubscribe)."""
-        nonlocal buffer, last_flush
-        seen_sigs: set[str] = set()
-        max_seen = 200
-        first_poll = True
-        while not stop.is_set():
+                continue
             try:
-                sigs_result = await get_signatures_for_address(wallet, network=network, limit=10)
-                if first_poll and sigs_result:
-                    # Seed seen_sigs so we only explain txs that happen *after* we start
-                    for item in sigs_result:
-                        s = item.get("signature")
-                        if s:
-                            seen_sigs.add(s)
-                    log.info("Devnet poll: seeded %s existing sigs (only new txs will be explained)", len(seen_sigs))
-                    first_poll = False
-                    await asyncio.sleep(POLL_INTERVAL_SEC)
-                    continue
-                first_poll = False
-                for item in sigs_result or []:
-                    sig = item.get("signature")
-                    if not sig or sig in seen_sigs:
-                        continue
-                    seen_sigs.add(sig)
-                    if len(seen_sigs) > max_seen:
-                        seen_sigs = {s for s, _, _ in buffer} | {it.get("signature") for it in (sigs_result or [])[:20]}
-                    fetched = await fetch_and_parse(sig, network=network)
-                    if fetched:
-                        _, parsed = fetched
-                        buffer.append((sig, parsed, time.monotonic()))
-                        log.info("Devnet poll: buffered tx %s (buffer size %s)", sig[:16], len(buffer))
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                log.warning("Devnet poll error: %s", e)
-            await asyncio.sleep(POLL_INTERVAL_SEC)
+                await asyncio.wait_for(wake.wait(), closes_at - now)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
 
-    async def ws_loop() -> None:
-        nonlocal buffer, last_flush
-        while not stop.is_set():
-            try:
-                async with websockets.connect(
-                    _ws_url(network),
-                    ping_interval=20,
-                    ping_timeout=10,
-                    close_timeout=5,
-                ) as ws:
-                    # logsSubscribe: filter by wallet mention
-                    await ws.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "logsSubscribe",
-                        "params": [
-                            {"mentions": [wallet]},
-                            {"commitment": "confirmed"},
-                        ],
-                    }))
-                    # first response is subscription id
-                    sub_resp = await ws.recv()
-                    sub_data = json.loads(sub_resp)
-                    if sub_data.get("error"):
-                        log.warning("logsSubscribe error: %s", sub_data["error"])
-                        await asyncio.sleep(5)
-                        continue
-                    log.info("Live listener subscribed for wallet %s... on %s (wait for txs from this wallet)", wallet[:12], network)
-                    while not stop.is_set():
-                        msg = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                        data = json.loads(msg)
-                        method = data.get("method")
-                        if method != "logsNotification":
-                            continue
-                        params = data.get("params") or {}
-                        result = params.get("result") or {}
-                        sig = result.get("signature")
-                        err = result.get("err")
-                        if not sig:
-                            continue
-                        log.info("logsNotification received for %s... (network=%s)", sig[:16], network)
-                        if err:
-                            log.debug("Tx %s failed on-chain: %s", sig[:16], err)
-                        fetched = await fetch_and_parse(sig, network=network)
-                        if fetched:
-                            _, parsed = fetched
-                            buffer.append((sig, parsed, time.monotonic()))
-                            log.info("Buffered tx %s (buffer size %s)", sig[:16], len(buffer))
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                log.warning("Live listener ws error: %s", e)
-                await asyncio.sleep(5)
-
-    flush_task = asyncio.create_task(flush_loop())
-    if _is_devnet(network):
-        log.info("Live listener using POLLING for devnet (wallet %s...)", wallet[:12])
-        poll_task = asyncio.create_task(poll_loop())
+    async def poll_loop() -> None:
+        """Devnet: new signatures come from the shared poll scheduler (public devnet WS often doesn't deliver logsSubscribe)."""
+        notifications: asyncio.Queue = asyncio.Queue()
+        poll_scheduler.subscribe(wallet, network, notifications.put_nowait)
         try:
-            await asyncio.gather(flush_task, poll_task)
+            while not stop.is_set():
+                item = await notifications.get()
+                sig = item.get("signature")
+                if not sig:
+                    continue
+                log.info("Devnet poll: new tx %s", sig[:16])
+                if accept(sig):
+                    await enqueue_fetch(sig)
         except asyncio.CancelledError:
             pass
         finally:
-            flush_task.cancel()
-            poll_task.cancel()
-            await flush()
-    else:
-        ws_task = asyncio.create_task(ws_loop())
+            poll_scheduler.unsubscribe(wallet, network, notifications.put_nowait)
+
+    async def ws_loop() -> None:
+        """Mainnet: logsSubscribe via the shared, multiplexed WebSocket pool (backend.ws_manager)."""
+        notifications: asyncio.Queue = asyncio.Queue()
+        await ws_manager.subscribe(wallet, network, notifications.put_nowait)
         try:
-            await asyncio.gather(flush_task, ws_task)
+            while not stop.is_set():
+                result = await notifications.get()
+                sig = result.get("signature")
+                err = result.get("err")
+                if not sig:
+                    continue
+                log.info("logsNotification received for %s... (network=%s)", sig[:16], network)
+                if err:
+                    log.debug("Tx %s failed on-chain: %s", sig[:16], err)
+                if accept(sig):
+                    await enqueue_fetch(sig)
         except asyncio.CancelledError:
             pass
         finally:
-            flush_task.cancel()
-            ws_task.cancel()
+            await ws_manager.unsubscribe(wallet, network, notifications.put_nowait)
+
+    if _is_devnet(network):
+        log.info("Live listener using POLLING for devnet (wallet %s...)", wallet[:12])
+        source = poll_loop()
+    else:
+        source = ws_loop()
+    tasks = [asyncio.create_task(group_loop()), asyncio.create_task(buffer_loop()), asyncio.create_task(source)]
+    _buffer_sizes[(network, wallet)] = held
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        _buffer_sizes.pop((network, wallet), None)
+        for task in [*tasks, *retrying]:
+            task.cancel()
+        while not pipeline.empty():
+            _, task = pipeline.get_nowait()
+            task.cancel()
+        while buffer:  # a group takes at most GROUP_MAX_TXS; emit every buffered tx
             await flush()
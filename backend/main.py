@@ -1,13 +1,18 @@
 """
 SolanaTxPlain API (README).
 - POST /explain → single tx explanation (legacy).
+- GET /explain/stream?tx_hash=xxx → same, streamed over SSE section by section.
 - GET /live/stream?wallet=xxx → SSE stream of live activity (grouped txs + AI).
+- POST /explain/batch → many signatures in one request, results streamed as NDJSON in completion order.
+- GET /metrics → Prometheus text format (stage latencies, LLM errors and rate-limit waits, cache hits, live listener state).
 """
 
 import asyncio
 import json
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -34,15 +39,72 @@ else:
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
-from backend.ai_explain import get_explanation
-from backend.live_listener import run_listener
-from backend.parser import parse_tx
-from backend.solana_client import get_transaction
+from backend.ai_explain import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    close_llm_clients,
+    crosscheck_model_id,
+    get_crosscheck,
+    get_explanation,
+    live_batcher,
+    llm_scheduler,
+    model_id,
+    prompt_stats,
+    sample_crosscheck,
+    stream_explanation,
+)
+from backend.cache import (
+    close_caches,
+    explanation_cache,
+    explanation_flights,
+    explanation_key,
+    template_cache,
+    tx_cache,
+    tx_flights,
+    tx_key,
+)
+from backend.history import HISTORY_MAX_SIGNATURES, wallet_history
+from backend.hub import hub
+from backend.live_listener import buffer_stats
+from backend.metrics import family, render, server_timing, span, start_timing
+from backend.parser import parse_many, parse_tx
+from backend.poller import poll_scheduler
+from backend.rules import FAST_PATH_ENABLED, explain_simple
+from backend.solana_client import (
+    RPCUnavailable,
+    close_clients,
+    get_transaction,
+    get_transactions,
+    rpc_stats,
+    start_clients,
+)
+from backend.template_cache import remember_template, template_cache_stats, templated_explanation
+from backend.ws_manager import ws_manager
+
+EXPLAIN_BATCH_MAX_SIGNATURES = int(os.environ.get("EXPLAIN_BATCH_MAX_SIGNATURES") or 500)
+EXPLAIN_BATCH_CONCURRENCY = int(os.environ.get("EXPLAIN_BATCH_CONCURRENCY") or 8)  # LLM explanations in flight per batch
+EXPLAIN_BATCH_FETCH_SIZE = 100  # signatures fetched (one batched RPC round) before their explanations start
 
-app = FastAPI(title="SolanaTxPlain", description="AI-powered Solana transaction explainer")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App-lifetime resources: pooled RPC and LLM clients are opened once and reused by every request."""
+    await start_clients()
+    try:
+        yield
+    finally:
+        await hub.close()
+        await ws_manager.close()
+        await poll_scheduler.close()
+        await close_clients()
+        await close_llm_clients()
+        close_caches()
+
+
+app = FastAPI(title="SolanaTxPlain", description="AI-powered Solana transaction explainer", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -50,6 +112,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Cache-Status"],
 )
 
 
@@ -74,8 +137,8 @@ def health():
 
 
 @app.get("/debug")
-def debug():
-    """Verify which API keys are loaded (masked). Use to confirm .env is read."""
+async def debug():
+    """Verify which API keys are loaded (masked) and show LLM scheduler and RPC endpoint state (breakers, queue depth, health)."""
     gemini = os.environ.get("GEMINI_API_KEY")
     openrouter = os.environ.get("OPENROUTER_API_KEY")
     return {
@@ -83,56 +146,104 @@ def debug():
         "GEMINI_MODEL": os.environ.get("GEMINI_MODEL", "(default: gemini-2.0-flash)"),
         "OPENROUTER_API_KEY": "set (" + (openrouter[:8] + "..." + openrouter[-4:] if openrouter and len(openrouter) > 12 else "***") + ")" if openrouter else "not set",
         "OPENROUTER_MODEL": os.environ.get("OPENROUTER_MODEL", "(default: google/gemini-2.0-flash)"),
+        "llm_scheduler": llm_scheduler.stats(),
+        "live_batcher": live_batcher.stats(),
+        "prompt_tokens": prompt_stats,
+        "template_cache": template_cache_stats(),
+        "rpc": rpc_stats(),
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage latency histograms and counters, plus cache / live state read now."""
+    caches = (tx_cache, explanation_cache, template_cache)
+    live = hub.stats()
+    buffers = buffer_stats()
+    scheduler = llm_scheduler.stats()
+    providers = [name for name in ("gemini", "openrouter") if name in scheduler]
+    rpc = rpc_stats()
+    endpoints = [({"network": network, "endpoint": e["endpoint"]}, e) for network, pool in rpc.items() for e in pool["endpoints"]]
+    collected = [
+        family(
+            "solana_tx_plain_cache_hits_total", "counter", "Cache hits by cache and tier.",
+            [({"cache": c.name, "tier": tier}, n) for c in caches for tier, n in c.hits.items()],
+        ),
+        family("solana_tx_plain_cache_misses_total", "counter", "Cache misses by cache.", [({"cache": c.name}, c.misses) for c in caches]),
+        family(
+            "solana_tx_plain_llm_calls_total", "counter", "LLM calls admitted by the scheduler.",
+            [({"provider": name}, scheduler[name]["calls"]) for name in providers],
+        ),
+        family(
+            "solana_tx_plain_llm_queue_depth", "gauge", "LLM calls waiting for a rate-limit slot.",
+            [({"provider": name, "priority": prio}, n) for name in providers for prio, n in scheduler[name]["queue_depth"].items()],
+        ),
+        family(
+            "solana_tx_plain_llm_breaker_open", "gauge", "1 while a provider's circuit breaker is not closed.",
+            [({"provider": name}, scheduler[name]["breaker"] != "closed") for name in providers],
+        ),
+        family("solana_tx_plain_sse_dropped_events_total", "counter", "Live events dropped for slow SSE clients.", [({}, live["dropped_events"])]),
+        family("solana_tx_plain_sse_disconnected_clients_total", "counter", "SSE clients disconnected for being too slow.", [({}, live["disconnected_clients"])]),
+        family("solana_tx_plain_live_listeners", "gauge", "Active live listeners (one per watched wallet).", [({}, live["listeners"])]),
+        family("solana_tx_plain_live_clients", "gauge", "Connected /live/stream clients.", [({}, live["clients"])]),
+        family("solana_tx_plain_live_buffered_txs", "gauge", "Txs held by all live listeners (fetching or grouping).", [({}, buffers["held_txs"])]),
+        family("solana_tx_plain_live_buffered_txs_max", "gauge", "Txs held by the fullest live listener.", [({}, buffers["max_held_txs"])]),
+        family("solana_tx_plain_rpc_requests_total", "counter", "HTTP requests sent per RPC endpoint.", [(labels, e["requests"]) for labels, e in endpoints]),
+        family(
+            "solana_tx_plain_rpc_errors_total", "counter", "RPC requests that failed over (429, 5xx, connection errors).",
+            [(labels, e["errors"]) for labels, e in endpoints],
+        ),
+        family("solana_tx_plain_rpc_endpoint_healthy", "gauge", "0 while an RPC endpoint is cooling down.", [(labels, e["healthy"]) for labels, e in endpoints]),
+        family(
+            "solana_tx_plain_rpc_hedged_requests_total", "counter", "Hedged getTransaction requests sent / won by the hedge.",
+            [({"network": network, "outcome": outcome}, n) for network, pool in rpc.items() for outcome, n in pool["hedges"].items()],
+        ),
+    ]
+    return PlainTextResponse(render(collected), media_type="text/plain; version=0.0.4")
+
+
+def _normalize_network(network: str | None) -> str:
+    network = (network or "mainnet").strip().lower() or "mainnet"
+    return network if network in ("mainnet", "devnet") else "mainnet"
+
+
 class ExplainRequest(BaseModel):
     tx_hash: str
     simple_mode: bool = True  # README Feature 8: Simple vs Technical mode
     network: str = "mainnet"  # mainnet | devnet
+    use_llm: bool = False  # skip the rule-based fast path and always ask the LLM
+    cross_check: bool = False  # also explain via OpenRouter (README Feature 7); see GET /explain/crosscheck
 
 
 @app.get("/live/stream")
-async def live_stream(request: Request, wallet: str = "", network: str = "mainnet"):
+async def live_stream(
+    request: Request, wallet: str = "", network: str = "mainnet", stream: bool = False, last_event_id: str = ""
+):
     """
     SSE stream of live Solana activity for a wallet.
     Query: ?wallet=YOUR_PUBKEY&network=mainnet|devnet. Groups txs within ~2.5s, explains via AI, pushes events.
+    &stream=1 also sends "activity_section" events (each explanation section as soon as the LLM finishes it).
+    All clients watching the same wallet share one listener (backend.hub). Events carry an `id:`; a reconnecting
+    client (Last-Event-ID header, or &last_event_id=) first gets the recent events it missed.
     """
     wallet = (wallet or "").strip()
-    network = (network or "mainnet").strip().lower() or "mainnet"
-    if network not in ("mainnet", "devnet"):
-        network = "mainnet"
+    network = _normalize_network(network)
     if not wallet or len(wallet) < 32:
         raise HTTPException(status_code=400, detail="Query param 'wallet' (Solana pubkey) is required.")
-    stop = asyncio.Event()
-    queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+    resume_from = (request.headers.get("last-event-id") or last_event_id or "").strip()
 
     async def event_gen():
-        task = asyncio.create_task(run_listener(wallet, queue, network=network, stop=stop))
+        client = hub.subscribe(wallet, network, sections=stream, last_event_id=resume_from)
         try:
-            while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=25.0)
-                except asyncio.TimeoutError:
-                    yield "data: {\"type\":\"ping\"}\n\n"
+            while not client.closed:
+                frame = await client.get(timeout=25.0)
+                if frame is None:
+                    if not client.closed:
+                        yield "data: {\"type\":\"ping\"}\n\n"
                     continue
-                payload = {
-                    "type": event.get("type"),
-                    "signatures": event.get("signatures", []),
-                    "count": event.get("count", 0),
-                    "wallet": event.get("wallet", ""),
-                    "explanation": event.get("explanation", {}),
-                    "just_happened": event.get("just_happened", False),
-                    "network": network,
-                }
-                yield f"data: {json.dumps(payload)}\n\n"
+                yield frame.data
         finally:
-            stop.set()
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            await hub.unsubscribe(wallet, network, client)
 
     return StreamingResponse(
         event_gen(),
@@ -141,29 +252,120 @@ async def live_stream(request: Request, wallet: str = "", network: str = "mainne
     )
 
 
-@app.post("/explain")
-async def explain(req: ExplainRequest):
-    tx_hash = (req.tx_hash or "").strip()
-    if not tx_hash:
-        raise HTTPException(status_code=400, detail="tx_hash is required")
-    network = (req.network or "mainnet").strip().lower() or "mainnet"
-    if network not in ("mainnet", "devnet"):
-        network = "mainnet"
+@app.get("/wallet/{address}/history")
+async def wallet_history_stream(
+    address: str,
+    network: str = "mainnet",
+    limit: int = 100,
+    before: str = "",
+    explain: bool = True,
+    format: str = "ndjson",
+):
+    """
+    Explain a wallet's past activity: pages back through its signatures (newest first, up to `limit`, max
+    HISTORY_MAX_SIGNATURES), groups bursts by blockTime like the live feed and streams each group as soon as it
+    is explained. format=ndjson (one JSON object per line) or sse. Events: group, progress, done, error
+    (see backend.history.wallet_history); continue with before=<cursor from done>. explain=0 only groups.
+    """
+    address = (address or "").strip()
+    if len(address) < 32:
+        raise HTTPException(status_code=400, detail="A Solana wallet address is required.")
+    network = _normalize_network(network)
+    if not 1 <= limit <= HISTORY_MAX_SIGNATURES:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {HISTORY_MAX_SIGNATURES}.")
+    sse = format.strip().lower() == "sse"
 
-    raw = await get_transaction(tx_hash, network=network)
-    if not raw:
-        raise HTTPException(status_code=404, detail="Transaction not found.")
+    async def body():
+        async for event in wallet_history(address, network, limit=limit, before=before.strip() or None, explain=explain):
+            data = json.dumps({**event, "network": network})
+            yield f"data: {data}\n\n" if sse else data + "\n"
 
-    parsed = parse_tx(raw)
-    ai = get_explanation(parsed, simple_mode=req.simple_mode)
+    if sse:
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
+        )
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
 
-    if ai.get("error"):
-        msg = ai.get("message", "AI explanation failed.")
-        if ai.get("error") == "quota":
-            raise HTTPException(status_code=429, detail=msg)
-        raise HTTPException(status_code=503, detail=msg)
 
-    # README API output + openrouter cross-check when both Gemini and OpenRouter ran
+async def _cached_transaction(tx_hash: str, network: str) -> tuple[dict | None, str]:
+    """
+    Raw getTransaction result via the content-addressed cache. Returns (raw, cache tier).
+    Concurrent misses for the same signature share one RPC call (tier "inflight" for the followers).
+    Raises HTTP 503 when every RPC endpoint is rate limiting or failing.
+    """
+    key = tx_key(network, tx_hash)
+
+    async def load() -> tuple[dict | None, str]:
+        raw, tier = await tx_cache.get(key)
+        if raw is None:
+            raw = await get_transaction(tx_hash, network=network)
+            if raw:
+                await tx_cache.set(key, raw)
+        return raw, tier
+
+    try:
+        (raw, tier), shared = await tx_flights.do(key, load)
+    except RPCUnavailable as e:
+        log.warning("getTransaction %s...: %s", tx_hash[:16], e)
+        raise HTTPException(status_code=503, detail="Solana RPC is unavailable right now; try again shortly.")
+    return raw, "inflight" if shared else tier
+
+
+_RESPONSE_TX_FIELDS = ("sol_balance_change", "token_balance_changes", "fee_paid", "slot", "block_time")
+
+
+async def _store_explanation(key: str, parsed: dict, ai: dict) -> None:
+    """Cache ai with the tx fields _explain_response reads, so /explain can answer a hit without the tx."""
+    await explanation_cache.set(key, {**ai, "tx": {k: parsed.get(k) for k in _RESPONSE_TX_FIELDS}})
+
+
+async def _cached_explanation(
+    parsed: dict, tx_hash: str, network: str, simple_mode: bool, priority: int = PRIORITY_INTERACTIVE
+) -> tuple[dict, str]:
+    """
+    get_explanation output via the cache (errors are never cached). Returns (ai, cache tier).
+    On a miss, a template from a structurally identical tx is tried first (tier "template", backend.template_cache).
+    Concurrent misses for the same (network, tx_hash, simple_mode) share one LLM call.
+    """
+    key = explanation_key(network, tx_hash, simple_mode, model_id())
+
+    async def load() -> tuple[dict, str]:
+        ai, tier = await explanation_cache.get(key)
+        if ai is None:
+            # Structurally identical tx explained before: re-fill its template instead of calling the LLM
+            ai = await templated_explanation(parsed, simple_mode, model_id())
+            if ai is not None:
+                return ai, "template"
+            ai = await get_explanation(parsed, simple_mode=simple_mode, priority=priority)
+            if not ai.get("error"):
+                await _store_explanation(key, parsed, ai)
+                await remember_template(parsed, simple_mode, model_id(), ai)
+        return ai, tier
+
+    (ai, tier), shared = await explanation_flights.do(key, load)
+    return ai, "inflight" if shared else tier
+
+
+async def _cached_crosscheck(parsed: dict, tx_hash: str, network: str, simple_mode: bool) -> tuple[dict, str]:
+    """get_crosscheck output via the explanation cache (own key, errors never cached). Returns (check, cache tier)."""
+    key = explanation_key(network, tx_hash, simple_mode, crosscheck_model_id())
+
+    async def load() -> tuple[dict, str]:
+        check, tier = await explanation_cache.get(key)
+        if check is None:
+            check = await get_crosscheck(parsed, simple_mode=simple_mode)
+            if not check.get("error"):
+                await explanation_cache.set(key, check)
+        return check, tier
+
+    (check, tier), shared = await explanation_flights.do(key, load)
+    return check, "inflight" if shared else tier
+
+
+def _explain_response(network: str, parsed: dict, ai: dict, explainer: str, check: dict | None = None) -> dict:
+    """README API output + openrouter cross-check (check: get_crosscheck output) when one was computed."""
     out = {
         "network": network,
         "summary": ai["summary"],
@@ -179,11 +381,269 @@ async def explain(req: ExplainRequest):
         "sections": ai.get("sections", {}),
         "slot": parsed.get("slot"),
         "block_time": parsed.get("block_time"),
+        "explainer": explainer,
     }
-    if ai.get("openrouter_summary") is not None or ai.get("openrouter_explanation"):
-        out["openrouter_summary"] = ai.get("openrouter_summary")
-        out["openrouter_explanation"] = ai.get("openrouter_explanation")
-        out["openrouter_intent"] = ai.get("openrouter_intent")
-        out["openrouter_risk"] = ai.get("openrouter_risk")
-        out["openrouter_sections"] = ai.get("openrouter_sections", {})
+    if ai.get("prompt_tokens") is not None:
+        out["prompt_tokens"] = ai["prompt_tokens"]  # estimated LLM input tokens for this explanation
+    if check and check.get("error"):
+        out["crosscheck_error"] = check.get("message")
+    elif check and ai.get("provider") != "openrouter":  # comparing OpenRouter with itself tells nothing
+        out["openrouter_summary"] = check.get("openrouter_summary")
+        out["openrouter_explanation"] = check.get("openrouter_explanation")
+        out["openrouter_intent"] = check.get("openrouter_intent")
+        out["openrouter_risk"] = check.get("openrouter_risk")
+        out["openrouter_sections"] = check.get("openrouter_sections", {})
     return out
+
+
+@app.post("/explain")
+async def explain(req: ExplainRequest, response: Response):
+    tx_hash = (req.tx_hash or "").strip()
+    if not tx_hash:
+        raise HTTPException(status_code=400, detail="tx_hash is required")
+    network = _normalize_network(req.network)
+    timings = start_timing()  # stage spans of this request -> Server-Timing
+    started = time.perf_counter()
+
+    # Explained before (and cross-checked, if asked): answer from the cache without fetching the tx
+    hit, hit_tier = await explanation_cache.get(explanation_key(network, tx_hash, req.simple_mode, model_id()), count_miss=False)
+    check, check_tier = (None, None)
+    if hit is not None and req.cross_check:
+        key = explanation_key(network, tx_hash, req.simple_mode, crosscheck_model_id())
+        check, check_tier = await explanation_cache.get(key, count_miss=False)
+    if hit is not None and hit.get("tx") is not None and (check is not None or not req.cross_check):
+        response.headers["X-Cache-Status"] = f"tx=skipped; explanation={hit_tier}" + (f"; crosscheck={check_tier}" if check_tier else "")
+        response.headers["Server-Timing"] = server_timing(timings + [("total", time.perf_counter() - started)])
+        response.headers["Timing-Allow-Origin"] = "*"
+        return _explain_response(network, hit["tx"], hit, "llm", check)
+
+    raw, tx_tier = await _cached_transaction(tx_hash, network)
+    if not raw:
+        raise HTTPException(status_code=404, detail="Transaction not found.")
+
+    with span("parse_tx"):
+        parsed = parse_tx(raw)
+    # Fast path: plain SOL / single token transfers are explained by rules, no LLM call
+    ai = explain_simple(parsed, req.simple_mode) if FAST_PATH_ENABLED and not req.use_llm else None
+    # Cross-check when asked for, or for a sampled fraction of LLM explanations; runs alongside the primary
+    want_check = req.cross_check or (ai is None and sample_crosscheck())
+    check_task = (
+        asyncio.create_task(_cached_crosscheck(parsed, tx_hash, network, req.simple_mode)) if want_check else None
+    )
+    if ai is not None:
+        explainer, ai_tier = "rules", "rules"
+    else:
+        ai, ai_tier = await _cached_explanation(parsed, tx_hash, network, req.simple_mode)
+        explainer = "template" if ai_tier == "template" else "llm"
+    check, check_tier = await check_task if check_task else (None, None)
+    response.headers["X-Cache-Status"] = f"tx={tx_tier}; explanation={ai_tier}" + (
+        f"; crosscheck={check_tier}" if check_tier else ""
+    )
+    timing = server_timing(timings + [("total", time.perf_counter() - started)])
+    response.headers["Server-Timing"] = timing
+    response.headers["Timing-Allow-Origin"] = "*"  # lets the cross-origin frontend read it via the Resource Timing API
+
+    if ai.get("error"):
+        msg = ai.get("message", "AI explanation failed.")
+        if ai.get("error") == "quota":
+            raise HTTPException(status_code=429, detail=msg, headers={"Server-Timing": timing})
+        raise HTTPException(status_code=503, detail=msg, headers={"Server-Timing": timing})
+
+    return _explain_response(network, parsed, ai, explainer, check)
+
+
+class ExplainBatchRequest(BaseModel):
+    signatures: list[str]
+    simple_mode: bool = True
+    network: str = "mainnet"  # mainnet | devnet
+    use_llm: bool = False  # skip the rule-based fast path and always ask the LLM
+
+
+async def _batch_transactions(signatures: list[str], network: str) -> list[dict | None]:
+    """Raw txs for signatures, in order: tx cache hits first, the misses in one batched RPC round (then cached)."""
+    raws: list[dict | None] = []
+    missing: list[int] = []
+    for i, sig in enumerate(signatures):
+        raw, _ = await tx_cache.get(tx_key(network, sig))
+        raws.append(raw)
+        if raw is None:
+            missing.append(i)
+    if missing:
+        fetched = await get_transactions([signatures[i] for i in missing], network=network)
+        for i, raw in zip(missing, fetched):
+            if raw:
+                raws[i] = raw
+                await tx_cache.set(tx_key(network, signatures[i]), raw)
+    return raws
+
+
+async def _explain_batch(signatures: list[str], network: str, simple_mode: bool, use_llm: bool):
+    """
+    Yields one item per signature as soon as it is ready (completion order), then a summary:
+      {"type": "result", "signature", "cache", ...same fields as POST /explain}
+      {"type": "error", "signature", "error": "not_found" | "rpc" | "quota" | "gemini" | ..., "message"}
+      {"type": "done", "total", "ok", "errors"}
+    Txs are fetched EXPLAIN_BATCH_FETCH_SIZE at a time; rule-explained txs are yielded right away, the rest go
+    through the explanation cache / templates / LLM (background priority) EXPLAIN_BATCH_CONCURRENCY at a time.
+    """
+    out: asyncio.Queue = asyncio.Queue()
+    sem = asyncio.Semaphore(max(1, EXPLAIN_BATCH_CONCURRENCY))
+    workers: set[asyncio.Task] = set()
+    done_marker = object()
+
+    def error(sig: str, code: str, message: str) -> dict:
+        return {"type": "error", "signature": sig, "error": code, "message": message}
+
+    async def explain_one(sig: str, parsed: dict) -> None:
+        async with sem:
+            try:
+                ai, tier = await _cached_explanation(parsed, sig, network, simple_mode, PRIORITY_BACKGROUND)
+            except Exception as e:
+                log.warning("Batch explain failed for %s: %s", sig[:16], e)
+                await out.put(error(sig, "llm", str(e)[:200]))
+                return
+        if ai.get("error"):
+            await out.put(error(sig, ai["error"], ai.get("message", "AI explanation failed.")))
+            return
+        explainer = "template" if tier == "template" else "llm"
+        await out.put({"type": "result", "signature": sig, "cache": tier, **_explain_response(network, parsed, ai, explainer)})
+
+    async def produce() -> None:
+        try:
+            for start in range(0, len(signatures), EXPLAIN_BATCH_FETCH_SIZE):
+                chunk = signatures[start:start + EXPLAIN_BATCH_FETCH_SIZE]
+                try:
+                    raws = await _batch_transactions(chunk, network)
+                except Exception as e:
+                    log.warning("Batch fetch of %s txs failed: %s", len(chunk), e)
+                    for sig in chunk:
+                        await out.put(error(sig, "rpc", str(e)[:200]))
+                    continue
+                with span("parse_tx"):
+                    parsed_list = parse_many(raws)
+                for sig, parsed in zip(chunk, parsed_list):
+                    if parsed is None:
+                        await out.put(error(sig, "not_found", "Transaction not found."))
+                        continue
+                    ai = explain_simple(parsed, simple_mode) if FAST_PATH_ENABLED and not use_llm else None
+                    if ai is not None:
+                        await out.put({"type": "result", "signature": sig, "cache": "rules", **_explain_response(network, parsed, ai, "rules")})
+                    else:
+                        workers.add(asyncio.create_task(explain_one(sig, parsed)))
+            await asyncio.gather(*workers)
+        except Exception as e:
+            log.warning("Batch explain aborted: %s", e)
+        finally:
+            await out.put(done_marker)
+
+    counts = {"result": 0, "error": 0}
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await out.get()
+            if item is done_marker:
+                break
+            counts[item["type"]] += 1
+            yield item
+        # Anything not reported (batch aborted) counts as an error
+        errors = len(signatures) - counts["result"]
+        yield {"type": "done", "total": len(signatures), "ok": counts["result"], "errors": errors}
+    finally:
+        producer.cancel()
+        for task in workers:
+            task.cancel()
+
+
+@app.post("/explain/batch")
+async def explain_batch(req: ExplainBatchRequest):
+    """
+    Explain up to EXPLAIN_BATCH_MAX_SIGNATURES signatures in one request (duplicates are explained once).
+    Response: NDJSON, one line per signature in completion order, with per-item errors instead of failing the
+    batch, then a "done" line (see _explain_batch). Cached txs and explanations are reused.
+    """
+    signatures = list(dict.fromkeys(s.strip() for s in req.signatures if s and s.strip()))
+    if not signatures:
+        raise HTTPException(status_code=400, detail="signatures is required")
+    if len(signatures) > EXPLAIN_BATCH_MAX_SIGNATURES:
+        raise HTTPException(status_code=400, detail=f"At most {EXPLAIN_BATCH_MAX_SIGNATURES} signatures per batch.")
+    network = _normalize_network(req.network)
+
+    async def body():
+        async for item in _explain_batch(signatures, network, req.simple_mode, req.use_llm):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
+@app.get("/explain/crosscheck")
+async def explain_crosscheck(response: Response, tx_hash: str = "", simple_mode: bool = True, network: str = "mainnet"):
+    """
+    Follow-up to /explain: the OpenRouter cross-check for a tx, computed on first request and cached.
+    Returns { network, tx_hash, openrouter_summary, openrouter_explanation, openrouter_intent, openrouter_risk, openrouter_sections }.
+    """
+    tx_hash = (tx_hash or "").strip()
+    if not tx_hash:
+        raise HTTPException(status_code=400, detail="tx_hash is required")
+    network = _normalize_network(network)
+    raw, tx_tier = await _cached_transaction(tx_hash, network)
+    if not raw:
+        raise HTTPException(status_code=404, detail="Transaction not found.")
+    check, tier = await _cached_crosscheck(parse_tx(raw), tx_hash, network, simple_mode)
+    response.headers["X-Cache-Status"] = f"tx={tx_tier}; crosscheck={tier}"
+    if check.get("error"):
+        status = {"quota": 429, "not_configured": 501}.get(check["error"], 503)
+        raise HTTPException(status_code=status, detail=check.get("message", "Cross-check failed."))
+    return {"network": network, "tx_hash": tx_hash, **check}
+
+
+@app.get("/explain/stream")
+async def explain_stream(tx_hash: str = "", simple_mode: bool = True, network: str = "mainnet", use_llm: bool = False):
+    """
+    SSE variant of /explain: LLM output is forwarded as it arrives.
+    Events: {"type": "delta", "text"}, {"type": "section", "key", "value"} as soon as each section header closes,
+    then {"type": "done", ...same body as POST /explain...} or {"type": "error", "error", "message"}.
+    Cached and rule-based explanations are sent as sections immediately. (Not coalesced like /explain.)
+    """
+    tx_hash = (tx_hash or "").strip()
+    if not tx_hash:
+        raise HTTPException(status_code=400, detail="tx_hash is required")
+    network = _normalize_network(network)
+    raw, tx_tier = await _cached_transaction(tx_hash, network)
+    if not raw:
+        raise HTTPException(status_code=404, detail="Transaction not found.")
+    parsed = parse_tx(raw)
+
+    async def event_gen():
+        ai = explain_simple(parsed, simple_mode) if FAST_PATH_ENABLED and not use_llm else None
+        explainer, ai_tier = "rules", "rules"
+        key = explanation_key(network, tx_hash, simple_mode, model_id())
+        if ai is None:
+            explainer = "llm"
+            ai, ai_tier = await explanation_cache.get(key)
+        if ai is None:
+            ai = await templated_explanation(parsed, simple_mode, model_id())
+            if ai is not None:
+                explainer, ai_tier = "template", "template"
+        if ai is not None:
+            for section, value in ai.get("sections", {}).items():
+                if value:
+                    yield f"data: {json.dumps({'type': 'section', 'key': section, 'value': value})}\n\n"
+        else:
+            async for event in stream_explanation(parsed, simple_mode=simple_mode):
+                if event["type"] == "done":
+                    ai = event["ai"]
+                    await _store_explanation(key, parsed, ai)
+                    await remember_template(parsed, simple_mode, model_id(), ai)
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+                if event["type"] == "error":
+                    return
+        done = {"type": "done", **_explain_response(network, parsed, ai, explainer)}
+        done["cache_status"] = f"tx={tx_tier}; explanation={ai_tier}"
+        yield f"data: {json.dumps(done)}\n\n"
+
+    return StreamingResponse(
+        event_gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
+    )
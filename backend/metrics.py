@@ -0,0 +1,154 @@
+"""
+Hot-path instrumentation: per-stage timing spans, Prometheus text exposition (GET /metrics) and Server-Timing.
+- span("stage") / @timed("stage") time a block into the stage_duration_seconds histogram; inside a request that
+  called start_timing(), the duration is also collected for that request's Server-Timing header.
+- Counters (LLM errors, ...) are incremented where things happen; cache hits, listener counts and buffer sizes
+  are read from the existing stats at scrape time (family() in main's /metrics).
+No client library: the text format is small. Everything is read and written on the event loop (/metrics and
+/debug are async handlers), so the registries need no locking.
+"""
+
+import functools
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Seconds; covers microsecond parsing up to slow LLM calls.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar("server_timings", default=None)
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (k + '="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(dict(key))} {value:g}" for key, value in self.values.items()]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.series: dict[tuple[tuple[str, str], ...], list[float]] = {}  # labels -> bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in self.series.items():
+            labels = dict(key)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': f'{bound:g}'})} {count:g}")
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {series[-1]:g}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(labels)} {series[-1]:g}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("solana_tx_plain_stage_duration_seconds", "Time spent per pipeline stage.")
+LLM_ERRORS = Counter("solana_tx_plain_llm_errors_total", "Failed or skipped LLM calls by provider and reason.")
+LIVE_DROPPED_TXS = Counter("solana_tx_plain_live_dropped_txs_total", "Signatures dropped because a wallet buffer was full.")
+LIVE_GROUPS = Counter("solana_tx_plain_live_groups_total", "Live groups flushed, by explainer.")
+LLM_WAIT_SECONDS = Histogram(
+    "solana_tx_plain_llm_wait_seconds", "Time admitted LLM calls waited for a rate-limit slot, by provider and priority."
+)
+LIVE_FETCH_RETRIES = Counter(
+    "solana_tx_plain_live_fetch_retries_total", "Live signatures not fetchable at first, by outcome (resolved / abandoned)."
+)
+
+REGISTRY: list[Counter | Histogram] = [
+    STAGE_SECONDS, LLM_ERRORS, LLM_WAIT_SECONDS, LIVE_DROPPED_TXS, LIVE_GROUPS, LIVE_FETCH_RETRIES
+]
+
+
+def start_timing() -> list[tuple[str, float]]:
+    """Collect span durations for the current request (and tasks it starts) until server_timing() is read."""
+    entries: list[tuple[str, float]] = []
+    _timings.set(entries)
+    return entries
+
+
+def observe(stage: str, seconds: float) -> None:
+    """Record a duration measured elsewhere (e.g. an async generator that cannot use span)."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    entries = _timings.get()
+    if entries is not None:
+        entries.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - t0)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator: every call of a (synchronous) function is a span."""
+
+    def wrap(fn: F) -> F:
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+
+        return inner  # type: ignore[return-value]
+
+    return wrap
+
+
+def server_timing(entries: list[tuple[str, float]]) -> str:
+    """Server-Timing header value: one metric per stage (repeated stages summed), durations in ms."""
+    totals: dict[str, float] = {}
+    for stage, seconds in entries:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+def family(name: str, kind: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> list[str]:
+    """Text lines for a metric read at scrape time (kind: "counter" | "gauge"), samples: [(labels, value), ...]."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    return lines + [f"{name}{_labels(labels)} {float(value or 0):g}" for labels, value in samples]
+
+
+def render(collected: list[list[str]]) -> str:
+    """Prometheus text format: the registry, then the families collected at scrape time."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    for metric_lines in collected:
+        lines += metric_lines
+    return "\n".join(lines) + "\n"
@@ -2,6 +2,7 @@
 Transaction Parser (README: Feature 2).
 Converts raw RPC response into structured data for AI and API.
 Output: sol_balance_change, token_balance_changes, programs_used, fee_paid, instruction_types.
+parse_many() parses a list of RPC results in one call (batch fetches, bulk explain).
 """
 
 from typing import Any
@@ -42,29 +43,9 @@ def parse_tx(raw: dict) -> dict[str, Any]:
                 "change_sol": round(delta / 1_000_000_000, 9),
             })
 
-    pre_token = meta.get("preTokenBalances") or []
-    post_token = meta.get("postTokenBalances") or []
-    token_balance_changes = []
-    for pre in pre_token:
-        post_entry = next(
-            (p for p in post_token if p.get("accountIndex") == pre.get("accountIndex") and p.get("mint") == pre.get("mint")),
-            None,
-        )
-        pre_ui = float((pre.get("uiTokenAmount") or {}).get("uiAmount") or 0)
-        post_ui = float((post_entry.get("uiTokenAmount") or {}).get("uiAmount") or 0) if post_entry else 0
-        mint = (pre.get("mint") or "unknown")[:12] + "..."
-        if post_ui != pre_ui:
-            token_balance_changes.append({
-                "mint": mint,
-                "before": pre_ui,
-                "after": post_ui,
-                "change": round(post_ui - pre_ui, 6),
-            })
-    for post in post_token:
-        if not any(p.get("accountIndex") == post.get("accountIndex") and p.get("mint") == post.get("mint") for p in pre_token):
-            post_ui = float((post.get("uiTokenAmount") or {}).get("uiAmount") or 0)
-            mint = (post.get("mint") or "unknown")[:12] + "..."
-            token_balance_changes.append({"mint": mint, "before": 0, "after": post_ui, "change": round(post_ui, 6)})
+    token_balance_changes = _token_balance_changes(
+        meta.get("preTokenBalances") or [], meta.get("postTokenBalances") or []
+    )
 
     instructions = message.get("instructions") or []
     program_ids = []
@@ -96,6 +77,50 @@ def parse_tx(raw: dict) -> dict[str, Any]:
     }
 
 
+def parse_many(raws: list[dict | None]) -> list[dict[str, Any] | None]:
+    """
+    Bulk parse_tx over RPC results (e.g. from solana_client.get_transactions).
+    Returns one entry per input, in order; None inputs (tx not found) stay None.
+    """
+    return [parse_tx(raw) if raw else None for raw in raws]
+
+
+def _ui_amount(entry: dict) -> float:
+    return float((entry.get("uiTokenAmount") or {}).get("uiAmount") or 0)
+
+
+def _token_balance_changes(pre_token: list[dict], post_token: list[dict]) -> list[dict[str, Any]]:
+    """
+    Match pre/post token balances by (accountIndex, mint) through a dict index — O(n) instead of a scan per entry.
+    Order: changed pre entries (pre order), then accounts that only appear post (post order).
+    """
+    post_by_key: dict[tuple[Any, Any], dict] = {}
+    for post in post_token:
+        post_by_key.setdefault((post.get("accountIndex"), post.get("mint")), post)
+
+    changes = []
+    pre_keys = set()
+    for pre in pre_token:
+        key = (pre.get("accountIndex"), pre.get("mint"))
+        pre_keys.add(key)
+        post_entry = post_by_key.get(key)
+        pre_ui = _ui_amount(pre)
+        post_ui = _ui_amount(post_entry) if post_entry else 0
+        if post_ui != pre_ui:
+            changes.append({
+                "mint": (pre.get("mint") or "unknown")[:12] + "...",
+                "before": pre_ui,
+                "after": post_ui,
+                "change": round(post_ui - pre_ui, 6),
+            })
+    for post in post_token:
+        if (post.get("accountIndex"), post.get("mint")) not in pre_keys:
+            post_ui = _ui_amount(post)
+            mint = (post.get("mint") or "unknown")[:12] + "..."
+            changes.append({"mint": mint, "before": 0, "after": post_ui, "change": round(post_ui, 6)})
+    return changes
+
+
 def _instruction_type(ix: dict) -> str:
     """Brief label for instruction (program name or 'unknown')."""
     pid = ix.get("programId") or ix.get("program") or ""
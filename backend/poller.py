@@ -0,0 +1,143 @@
+"""
+Central polling scheduler for live activity on networks without reliable logsSubscribe (devnet).
+All watched wallets of a network are polled together in JSON-RPC batches of getSignaturesForAddress,
+using each wallet's newest seen signature as the `until` cursor so only new signatures come back.
+Intervals adapt per wallet: active wallets are polled every POLL_MIN_INTERVAL_SEC, idle ones back off
+to POLL_MAX_INTERVAL_SEC. This keeps request volume under public devnet rate limits as watchers grow.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from backend.solana_client import get_signatures_for_address, get_signatures_for_addresses
+
+log = logging.getLogger("solana_tx_plain")
+
+POLL_INTERVAL_SEC = float(os.environ.get("POLL_INTERVAL_SEC") or 2.0)  # starting interval per wallet
+POLL_MIN_INTERVAL_SEC = float(os.environ.get("POLL_MIN_INTERVAL_SEC") or 1.0)
+POLL_MAX_INTERVAL_SEC = float(os.environ.get("POLL_MAX_INTERVAL_SEC") or 15.0)
+POLL_BACKOFF = 1.5  # idle poll: interval *= POLL_BACKOFF
+POLL_TICK_SEC = 0.25
+POLL_PAGE_LIMIT = 25  # signatures per getSignaturesForAddress page
+POLL_MAX_PAGES = 4  # pages fetched with `before` when a wallet had a big burst between polls
+
+SignatureCallback = Callable[[dict[str, Any]], None]
+
+
+class _Watch:
+    def __init__(self) -> None:
+        self.callbacks: list[SignatureCallback] = []
+        self.cursor: str | None = None  # newest signature already reported
+        self.seeded = False
+        self.interval = POLL_INTERVAL_SEC
+        self.next_due = 0.0
+
+
+class PollScheduler:
+    """subscribe(wallet, network, callback): callback(item) receives each new signature item, oldest first."""
+
+    def __init__(self) -> None:
+        self._watches: dict[str, dict[str, _Watch]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def subscribe(self, wallet: str, network: str, callback: SignatureCallback) -> None:
+        watches = self._watches.setdefault(network, {})
+        watch = watches.get(wallet)
+        if watch is None:
+            watch = watches[wallet] = _Watch()
+        watch.callbacks.append(callback)
+        task = self._tasks.get(network)
+        if task is None or task.done():
+            self._tasks[network] = asyncio.create_task(self._run(network))
+
+    def unsubscribe(self, wallet: str, network: str, callback: SignatureCallback) -> None:
+        watches = self._watches.get(network) or {}
+        watch = watches.get(wallet)
+        if watch is None:
+            return
+        if callback in watch.callbacks:
+            watch.callbacks.remove(callback)
+        if watch.callbacks:
+            return
+        del watches[wallet]
+        if not watches:
+            self._watches.pop(network, None)
+            task = self._tasks.pop(network, None)
+            if task is not None:
+                task.cancel()
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        self._watches.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {"wallets": sum(len(w) for w in self._watches.values())}
+
+    async def _run(self, network: str) -> None:
+        while True:
+            now = time.monotonic()
+            watches = self._watches.get(network) or {}
+            due = [(wallet, w) for wallet, w in watches.items() if w.next_due <= now]
+            if due:
+                try:
+                    await self._poll(network, due)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    log.warning("Poll scheduler error (%s): %s", network, e)
+                    for _, w in due:
+                        w.next_due = time.monotonic() + w.interval
+            await asyncio.sleep(POLL_TICK_SEC)
+
+    async def _poll(self, network: str, due: list[tuple[str, _Watch]]) -> None:
+        queries = []
+        for wallet, w in due:
+            if not w.seeded:
+                queries.append((wallet, {"limit": 1}))  # only need the newest signature as cursor
+            else:
+                queries.append((wallet, {"limit": POLL_PAGE_LIMIT, **({"until": w.cursor} if w.cursor else {})}))
+        results = await get_signatures_for_addresses(queries, network)
+        for (wallet, w), items in zip(due, results):
+            if items is None:
+                w.next_due = time.monotonic() + w.interval
+                continue
+            if not w.seeded:
+                # Seed the cursor so we only report txs that happen *after* we start
+                w.seeded = True
+                w.cursor = items[0].get("signature") if items else None
+                log.info("Poll scheduler: seeded %s... on %s (only new txs will be explained)", wallet[:12], network)
+            elif items:
+                if len(items) >= POLL_PAGE_LIMIT:
+                    items = items + await self._page_back(network, wallet, w.cursor, items[-1].get("signature"))
+                w.cursor = items[0].get("signature") or w.cursor
+                w.interval = POLL_MIN_INTERVAL_SEC
+                for item in reversed(items):
+                    for callback in list(w.callbacks):
+                        callback(item)
+            else:
+                w.interval = min(w.interval * POLL_BACKOFF, POLL_MAX_INTERVAL_SEC)
+            w.next_due = time.monotonic() + w.interval
+
+    async def _page_back(self, network: str, wallet: str, until: str | None, before: str | None) -> list[dict]:
+        """Fetch older pages (between until and before) when more than one page of new signatures arrived."""
+        out: list[dict] = []
+        for _ in range(POLL_MAX_PAGES - 1):
+            if not before:
+                break
+            page = await get_signatures_for_address(wallet, network=network, limit=POLL_PAGE_LIMIT, before=before, until=until)
+            out.extend(page)
+            if len(page) < POLL_PAGE_LIMIT:
+                break
+            before = page[-1].get("signature")
+        return out
+
+
+poll_scheduler = PollScheduler()
@@ -0,0 +1,133 @@
+"""
+Rule-based fast path (no LLM) for the most common transaction shapes.
+Recognizes plain SOL transfers and single SPL token transfers from parse_tx output and returns the same
+section dict as ai_explain (get_explanation / explain_group) in microseconds.
+Returns None when a transaction does not match a known shape — the caller then asks the LLM.
+"""
+
+import os
+from typing import Any
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+COMPUTE_BUDGET_PROGRAM = "ComputeBudget111111111111111111111111111111"
+TOKEN_PROGRAMS = ("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA", "TokenzQdBNbLqP5VveDT4ewwMTx8nVQ4Nw7YNLzSJp5")
+ASSOCIATED_TOKEN_PROGRAM = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+PROGRAM_NAMES = {
+    SYSTEM_PROGRAM: "Solana System Program",
+    COMPUTE_BUDGET_PROGRAM: "Compute Budget Program",
+    TOKEN_PROGRAMS[0]: "SPL Token Program",
+    TOKEN_PROGRAMS[1]: "SPL Token-2022 Program",
+    ASSOCIATED_TOKEN_PROGRAM: "Associated Token Account Program",
+}
+MAX_ATA_RENT_SOL = 0.0025  # rent for a new token account (~0.00204 SOL) paid to that account
+
+FAST_PATH_ENABLED = (os.environ.get("FAST_PATH_ENABLED") or "1").strip().lower() not in ("0", "false", "no")
+
+
+def _fmt(amount: float) -> str:
+    return f"{abs(amount):.9f}".rstrip("0").rstrip(".") or "0"
+
+
+def _programs_text(programs: list[str], simple_mode: bool) -> str:
+    names = [PROGRAM_NAMES.get(p, p) for p in programs if p != COMPUTE_BUDGET_PROGRAM]
+    text = ", ".join(names) or "Solana System Program"
+    if not simple_mode:
+        text += f" ({', '.join(programs)})"
+    return text
+
+
+def _classify(parsed: dict[str, Any]) -> dict[str, Any] | None:
+    """Match parsed against known shapes. Returns {intent, summary, wallet_impact, explanation} or None."""
+    programs = set(parsed.get("programs_used") or [])
+    sol = parsed.get("sol_balance_change") or []
+    tokens = parsed.get("token_balance_changes") or []
+    if not programs:
+        return None
+
+    if programs <= {SYSTEM_PROGRAM, COMPUTE_BUDGET_PROGRAM} and SYSTEM_PROGRAM in programs and not tokens:
+        senders = [c for c in sol if c["change_sol"] < 0]
+        receivers = [c for c in sol if c["change_sol"] > 0]
+        if len(senders) != 1 or not receivers:
+            return None
+        sent = sum(c["change_sol"] for c in receivers)
+        sender = senders[0]["account"]
+        to = receivers[0]["account"] if len(receivers) == 1 else f"{len(receivers)} accounts"
+        return {
+            "intent": "sol transfer",
+            "summary": f"Sent {_fmt(sent)} SOL from {sender} to {to} (a plain SOL transfer through the System Program).",
+            "wallet_impact": "; ".join(
+                f"{c['account']}: {'+' if c['change_sol'] > 0 else '-'}{_fmt(c['change_sol'])} SOL" for c in sol
+            ),
+            "explanation": (
+                f"The sender {sender} transferred {_fmt(sent)} SOL to {to} using the Solana System Program. "
+                "No tokens or other programs were involved. The sender's balance also went down by the network fee."
+            ),
+        }
+
+    if programs <= {*TOKEN_PROGRAMS, ASSOCIATED_TOKEN_PROGRAM, COMPUTE_BUDGET_PROGRAM, SYSTEM_PROGRAM} and programs & set(TOKEN_PROGRAMS):
+        if len(tokens) != 2 or tokens[0]["mint"] != tokens[1]["mint"]:
+            return None
+        out_c, in_c = sorted(tokens, key=lambda t: t["change"])
+        if not (out_c["change"] < 0 < in_c["change"]) or abs(out_c["change"] + in_c["change"]) > 1e-9:
+            return None
+        # Only the fee payer loses SOL (fee, maybe rent); the only SOL gain allowed is rent for a new token account.
+        if any(c["change_sol"] > MAX_ATA_RENT_SOL for c in sol):
+            return None
+        amount = _fmt(in_c["change"])
+        created = " A new token account was created for the receiver." if in_c["before"] == 0 and ASSOCIATED_TOKEN_PROGRAM in programs else ""
+        return {
+            "intent": "token transfer",
+            "summary": f"{amount} tokens of mint {in_c['mint']} were transferred from one token account to another.{created}",
+            "wallet_impact": f"Sender: -{amount} (balance {out_c['before']} → {out_c['after']}); receiver: +{amount} (balance {in_c['before']} → {in_c['after']}).",
+            "explanation": (
+                f"This is a single SPL token transfer of {amount} tokens (mint {in_c['mint']}). "
+                "The token program moved the amount between the two token accounts and the fee payer paid the network fee."
+                + created
+            ),
+        }
+    return None
+
+
+def explain_simple(parsed: dict[str, Any], simple_mode: bool = True) -> dict[str, Any] | None:
+    """Same shape as get_explanation for recognized shapes (no openrouter_* cross-check); None otherwise."""
+    shape = _classify(parsed)
+    if shape is None:
+        return None
+    fee = parsed.get("fee_paid", 0)
+    sections = {
+        "summary": shape["summary"],
+        "intent": shape["intent"],
+        "wallet_impact": shape["wallet_impact"],
+        "fees": f"{_fmt(fee)} SOL as the network transaction fee.",
+        "programs_used": _programs_text(parsed.get("programs_used") or [], simple_mode),
+        "risk": "No suspicious activity.",
+        "explanation": shape["explanation"],
+    }
+    return {**sections, "sections": dict(sections), "risk_flags": []}
+
+
+def explain_group_simple(transactions: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Same shape as explain_group when every tx in the group matches the same known shape; None otherwise."""
+    shapes = [_classify(tx) for tx in transactions]
+    if not shapes or any(s is None for s in shapes) or len({s["intent"] for s in shapes}) != 1:
+        return None
+    total_fee = sum(float(tx.get("fee_paid") or 0) for tx in transactions)
+    programs = list(dict.fromkeys(p for tx in transactions for p in tx.get("programs_used") or []))
+    n = len(shapes)
+    if n == 1:
+        summary, explanation, why = shapes[0]["summary"], shapes[0]["explanation"], "—"
+    else:
+        label = {"sol transfer": "SOL transfers", "token transfer": "token transfers"}[shapes[0]["intent"]]
+        summary = f"{n} {label} landed within a few seconds. " + " ".join(s["summary"] for s in shapes[:3])
+        explanation = " ".join(s["explanation"] for s in shapes[:3])
+        why = f"These were {n} separate transfers; Solana confirms each in well under a second, so they arrived as one burst."
+    return {
+        "summary": summary,
+        "intent": shapes[0]["intent"],
+        "wallet_impact": "; ".join(s["wallet_impact"] for s in shapes[:5]),
+        "fees": f"~{_fmt(total_fee)} SOL total as network fees.",
+        "programs_used": _programs_text(programs, simple_mode=True),
+        "risk": "No suspicious activity.",
+        "why_multiple_txs": why,
+        "explanation": explanation,
+    }
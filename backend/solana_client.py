@@ -1,65 +1,471 @@
-"""Fetch Solana transaction data via public RPC (README: Feature 1 — Transaction Fetching)."""
+"""Fetch Solana transaction data via public RPC (README: Feature 1 — Transaction Fetching).
 
+One long-lived httpx.AsyncClient per network (HTTP/2, keep-alive pool) is shared by /explain and the
+live listener, so requests reuse warm connections instead of paying a TCP+TLS handshake each time.
+main.py opens the pool on startup (start_clients) and closes it on shutdown (close_clients).
+get_transactions sends JSON-RPC batches; get_transaction_batched coalesces concurrent single lookups into them.
+Several endpoints per network (comma-separated SOLANA_MAINNET_RPC / SOLANA_DEVNET_RPC): each request goes to the
+healthy endpoint with the lowest latency EWMA (weighted by in-flight requests); a 429 / 5xx / connection error puts
+that endpoint in a cooldown and the request fails over to the next one. With RPC_HEDGE=1, a getTransaction that has
+not answered after the recent p95 latency is also sent to a second endpoint and the first answer wins.
+"""
+
+import asyncio
+import logging
 import os
+import time
+from collections import deque
 
 import httpx
 
+from backend.metrics import span
+
+log = logging.getLogger("solana_tx_plain")
+
+# Comma-separated for several endpoints (load-balanced, with failover).
 SOLANA_MAINNET_RPC = os.environ.get("SOLANA_MAINNET_RPC") or "https://api.mainnet-beta.solana.com"
 SOLANA_DEVNET_RPC = os.environ.get("SOLANA_DEVNET_RPC") or "https://api.devnet.solana.com"
 
+# Connection pool limits; override per network with SOLANA_MAINNET_RPC_MAX_CONNECTIONS etc.
+RPC_MAX_CONNECTIONS = int(os.environ.get("RPC_MAX_CONNECTIONS") or 50)
+RPC_MAX_KEEPALIVE = int(os.environ.get("RPC_MAX_KEEPALIVE") or 20)
+RPC_KEEPALIVE_EXPIRY_SEC = float(os.environ.get("RPC_KEEPALIVE_EXPIRY_SEC") or 60.0)
+RPC_CONNECT_TIMEOUT_SEC = float(os.environ.get("RPC_CONNECT_TIMEOUT_SEC") or 5.0)
+RPC_HTTP2 = (os.environ.get("RPC_HTTP2") or "1").strip().lower() not in ("0", "false", "no")
+GET_TRANSACTION_TIMEOUT_SEC = 30.0
+GET_SIGNATURES_TIMEOUT_SEC = 15.0
+RPC_BATCH_SIZE = int(os.environ.get("RPC_BATCH_SIZE") or 50)  # split further if the provider rejects it
+RPC_BATCH_WINDOW_SEC = float(os.environ.get("RPC_BATCH_WINDOW_MS") or 5) / 1000
+
+# Endpoint selection and failover (only matters with several endpoints per network)
+RPC_EWMA_ALPHA = 0.3  # weight of the newest latency sample
+RPC_COOLDOWN_SEC = float(os.environ.get("RPC_COOLDOWN_SEC") or 5.0)  # after a 429 / 5xx / error; doubles per consecutive failure
+RPC_COOLDOWN_MAX_SEC = 60.0
+RPC_HEDGE = (os.environ.get("RPC_HEDGE") or "0").strip().lower() in ("1", "true", "yes")
+RPC_HEDGE_MIN_DELAY_SEC = float(os.environ.get("RPC_HEDGE_MIN_DELAY_MS") or 50) / 1000
+RPC_HEDGE_INITIAL_DELAY_SEC = float(os.environ.get("RPC_HEDGE_INITIAL_DELAY_MS") or 500) / 1000  # until enough samples
+HEDGE_PERCENTILE = 0.95
+LATENCY_SAMPLES = 200  # recent successful latencies per network and request kind (single call / batch)
+MIN_HEDGE_SAMPLES = 20
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_batchers: dict[str, "_TransactionBatcher"] = {}
+_pools: dict[str, "_EndpointPool"] = {}
+
+
+class BatchRejected(Exception):
+    """The RPC provider refused a JSON-RPC batch itself (HTTP 400 / 413, JSON-RPC error or non-list body): split it."""
+
+
+class RPCError(Exception):
+    """The RPC answered a call with a JSON-RPC error."""
+
+
+class RPCUnavailable(Exception):
+    """The RPC provider is rate limiting or failing (429 / 5xx): retry later; smaller batches would not help."""
+
+
+def _network_key(network: str) -> str:
+    return "devnet" if (network or "").strip().lower() == "devnet" else "mainnet"
+
+
+def _rpc_urls(network: str) -> list[str]:
+    raw = SOLANA_DEVNET_RPC if _network_key(network) == "devnet" else SOLANA_MAINNET_RPC
+    return [url.strip() for url in raw.split(",") if url.strip()]
+
+
+def _label(url: str) -> str:
+    """Endpoint name for logs and stats: scheme and host only (provider URLs often carry an API key)."""
+    u = httpx.URL(url)
+    return f"{u.scheme}://{u.host}" + (f":{u.port}" if u.port else "")
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    try:
+        return min(float(resp.headers.get("retry-after", "")), RPC_COOLDOWN_MAX_SEC)
+    except ValueError:
+        return None
+
+
+class _Endpoint:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.label = _label(url)
+        self.ewma: float | None = None  # seconds; None until the first success (untried endpoints go first)
+        self.inflight = 0
+        self.failures = 0  # consecutive
+        self.down_until = 0.0
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def score(self) -> float:
+        return (self.ewma or 0.0) * (self.inflight + 1)
+
+    def success(self, latency: float) -> None:
+        self.ewma = latency if self.ewma is None else RPC_EWMA_ALPHA * latency + (1 - RPC_EWMA_ALPHA) * self.ewma
+        self.failures = 0
+
+    def failure(self, retry_after: float | None = None) -> None:
+        self.failures += 1
+        self.stats["errors"] += 1
+        cooldown = retry_after if retry_after is not None else RPC_COOLDOWN_SEC * 2 ** (self.failures - 1)
+        self.down_until = time.monotonic() + min(cooldown, RPC_COOLDOWN_MAX_SEC)
+
+
+class _EndpointPool:
+    """The RPC endpoints of one network: latency-aware selection, cooldown after failures, failover."""
+
+    def __init__(self, network: str, urls: list[str]) -> None:
+        self.network = network
+        self.endpoints = [_Endpoint(url) for url in urls]
+        self.samples: dict[str, deque[float]] = {"call": deque(maxlen=LATENCY_SAMPLES), "batch": deque(maxlen=LATENCY_SAMPLES)}
+        self.hedges = {"sent": 0, "won": 0}
+
+    def pick(self, avoid: set[_Endpoint]) -> _Endpoint:
+        """Healthy endpoint with the best score, preferring ones not in avoid; the soonest to recover if none is healthy."""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e not in avoid] or self.endpoints
+        healthy = [e for e in candidates if e.healthy(now)]
+        if healthy:
+            return min(healthy, key=_Endpoint.score)
+        return min(candidates, key=lambda e: e.down_until)
+
+    def hedge_delay(self, kind: str) -> float:
+        samples = sorted(self.samples[kind])
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return RPC_HEDGE_INITIAL_DELAY_SEC
+        return max(RPC_HEDGE_MIN_DELAY_SEC, samples[int(HEDGE_PERCENTILE * (len(samples) - 1))])
+
+    async def request(self, payload: dict | list, timeout: float, kind: str, tried: set[_Endpoint]) -> httpx.Response:
+        """
+        POST payload, failing over on 429 / 5xx / connection errors (at most one attempt per endpoint).
+        tried collects the endpoints used (shared with a hedged twin). Raises RPCUnavailable once every attempt
+        failed that way, so callers back off instead of retrying (e.g. batch splitting) against cooling endpoints.
+        """
+        if not self.endpoints:
+            raise RuntimeError("no RPC endpoint configured")
+        error: Exception | None = None
+        last = ""
+        for _ in range(len(self.endpoints)):
+            endpoint = self.pick(tried)
+            tried.add(endpoint)
+            endpoint.stats["requests"] += 1
+            endpoint.inflight += 1
+            t0 = time.perf_counter()
+            try:
+                resp = await _client(self.network).post(
+                    endpoint.url, json=payload, timeout=httpx.Timeout(timeout, connect=RPC_CONNECT_TIMEOUT_SEC)
+                )
+            except httpx.TransportError as e:
+                endpoint.failure()
+                error, last = e, e.__class__.__name__
+                log.info("RPC %s failed (%s); trying another endpoint", endpoint.label, e.__class__.__name__)
+                continue
+            finally:
+                endpoint.inflight -= 1
+            if resp.status_code == 429 or resp.status_code >= 500:
+                if resp.status_code == 429:
+                    endpoint.stats["rate_limited"] += 1
+                endpoint.failure(_retry_after(resp))
+                last = f"HTTP {resp.status_code}"
+                log.info("RPC %s answered HTTP %s; trying another endpoint", endpoint.label, resp.status_code)
+                continue
+            latency = time.perf_counter() - t0
+            endpoint.success(latency)
+            self.samples[kind].append(latency)
+            return resp
+        raise RPCUnavailable(f"no {self.network} RPC endpoint available (last: {last})") from error
+
+
+def _pool(network: str) -> _EndpointPool:
+    key = _network_key(network)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = _EndpointPool(key, _rpc_urls(key))
+    return pool
+
+
+async def _send(network: str, payload: dict | list, timeout: float, hedge: bool = False) -> httpx.Response:
+    """
+    POST a JSON-RPC payload through the endpoint pool. hedge (with RPC_HEDGE and 2+ endpoints): if no answer
+    arrives within the recent p95 latency, send it to another endpoint too and take whichever succeeds first.
+    """
+    pool = _pool(network)
+    kind = "batch" if isinstance(payload, list) else "call"
+    tried: set[_Endpoint] = set()
+    if not (hedge and RPC_HEDGE and len(pool.endpoints) > 1):
+        return await pool.request(payload, timeout, kind, tried)
+    first = asyncio.create_task(pool.request(payload, timeout, kind, tried))
+    done, _ = await asyncio.wait({first}, timeout=pool.hedge_delay(kind))
+    if done:
+        return first.result()
+    pool.hedges["sent"] += 1
+    second = asyncio.create_task(pool.request(payload, timeout, kind, tried))
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and (task.result().status_code == 200 or not pending):
+                    if task is second:
+                        pool.hedges["won"] += 1
+                    return task.result()
+        return first.result()  # neither succeeded: first's response or RPCUnavailable
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+
 
-def _rpc_url(network: str) -> str:
-    return SOLANA_DEVNET_RPC if (network or "").strip().lower() == "devnet" else SOLANA_MAINNET_RPC
+def rpc_stats() -> dict[str, dict]:
+    """Per network: endpoint health, latency EWMA and counters, plus hedging counters (for /debug and /metrics)."""
+    now = time.monotonic()
+    return {
+        key: {
+            "hedges": dict(pool.hedges),
+            "endpoints": [
+                {
+                    "endpoint": e.label,
+                    "healthy": e.healthy(now),
+                    "ewma_ms": round(e.ewma * 1000, 1) if e.ewma is not None else None,
+                    "inflight": e.inflight,
+                    **e.stats,
+                }
+                for e in pool.endpoints
+            ],
+        }
+        for key, pool in _pools.items()
+    }
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    return float(raw) if raw else default
+
+
+def _pool_limits(network: str) -> httpx.Limits:
+    prefix = f"SOLANA_{_network_key(network).upper()}_RPC"
+    return httpx.Limits(
+        max_connections=int(_env_number(f"{prefix}_MAX_CONNECTIONS", RPC_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(_env_number(f"{prefix}_MAX_KEEPALIVE", RPC_MAX_KEEPALIVE)),
+        keepalive_expiry=_env_number(f"{prefix}_KEEPALIVE_EXPIRY_SEC", RPC_KEEPALIVE_EXPIRY_SEC),
+    )
+
+
+def _client(network: str) -> httpx.AsyncClient:
+    """Shared pooled client for network (created lazily if start_clients was not called, e.g. scripts)."""
+    key = _network_key(network)
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=RPC_HTTP2,
+            limits=_pool_limits(key),
+            timeout=httpx.Timeout(GET_TRANSACTION_TIMEOUT_SEC, connect=RPC_CONNECT_TIMEOUT_SEC),
+        )
+        _clients[key] = client
+    return client
+
+
+async def start_clients() -> None:
+    """Open the pooled RPC clients for both networks (FastAPI startup)."""
+    for network in ("mainnet", "devnet"):
+        _client(network)
+
+
+async def close_clients() -> None:
+    """Close the pooled RPC clients (FastAPI shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    _batchers.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def _rpc_call(method: str, params: list, network: str, timeout: float) -> dict:
+    resp = await _send(
+        network,
+        {"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+        timeout,
+        hedge=method == "getTransaction",
+    )
+    return resp.json()
+
+
+async def _rpc_batch(calls: list[tuple[str, list]], network: str, timeout: float) -> list[dict]:
+    """Send calls as one JSON-RPC batch. Returns one response object per call, in call order."""
+    resp = await _send(
+        network,
+        [{"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(calls)],
+        timeout,
+        hedge=all(method == "getTransaction" for method, _ in calls),
+    )
+    if resp.status_code in (400, 413):
+        raise BatchRejected(f"HTTP {resp.status_code}")
+    if resp.status_code != 200:
+        raise RPCUnavailable(f"HTTP {resp.status_code}")
+    data = resp.json()
+    if not isinstance(data, list):
+        raise BatchRejected(str((data or {}).get("error") or "non-list response")[:200])
+    by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+    return [by_id.get(i) or {"error": {"message": "missing from batch response"}} for i in range(len(calls))]
+
+
+def _tx_params(tx_hash: str) -> list:
+    return [tx_hash, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]
 
 
 async def get_signatures_for_address(
-    address: str, network: str = "mainnet", limit: int = 10, before: str | None = None
+    address: str,
+    network: str = "mainnet",
+    limit: int = 10,
+    before: str | None = None,
+    *,
+    until: str | None = None,
+    timeout: float = GET_SIGNATURES_TIMEOUT_SEC,
 ) -> list[dict]:
     """
     Fetch recent transaction signatures for an address (for polling-based live feed).
-    Returns list of { signature, blockTime, err, ... }.
+    Returns list of { signature, blockTime, err, ... }, newest first (empty: no more signatures).
+    before/until are signature cursors: only signatures older than before / newer than until.
+    Raises RPCError on a JSON-RPC error, so a failed page is not mistaken for the end of the history.
     """
-    url = _rpc_url(network)
     params: list = [address, {"limit": limit}]
     if before:
         params[1]["before"] = before
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(
-            url,
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getSignaturesForAddress",
-                "params": params,
-            },
-        )
-        data = resp.json()
-        if data.get("error"):
-            return []
-        return data.get("result") or []
+    if until:
+        params[1]["until"] = until
+    data = await _rpc_call("getSignaturesForAddress", params, network, timeout)
+    if data.get("error"):
+        raise RPCError(str(data["error"].get("message") if isinstance(data["error"], dict) else data["error"])[:200])
+    return data.get("result") or []
 
 
-async def get_transaction(tx_hash: str, network: str = "mainnet") -> dict | None:
+async def get_transaction(
+    tx_hash: str, network: str = "mainnet", *, timeout: float = GET_TRANSACTION_TIMEOUT_SEC
+) -> dict | None:
     """
     Fetch full transaction by signature.
     network: "mainnet" (default) or "devnet".
     Returns RPC result: { meta, transaction } or None if not found.
     """
-    url = _rpc_url(network)
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(
-            url,
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTransaction",
-                "params": [
-                    tx_hash,
-                    {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0},
-                ],
-            },
+    with span("get_transaction"):
+        data = await _rpc_call("getTransaction", _tx_params(tx_hash), network, timeout)
+    if data.get("error"):
+        return None
+    return data.get("result")
+
+
+async def get_transactions(
+    signatures: list[str],
+    network: str = "mainnet",
+    *,
+    batch_size: int = RPC_BATCH_SIZE,
+    timeout: float = GET_TRANSACTION_TIMEOUT_SEC,
+) -> list[dict | None]:
+    """
+    Fetch many transactions with JSON-RPC batch requests (batch_size per request, sent concurrently).
+    Returns one entry per signature, in order: the RPC result, or None if not found / that item errored.
+    A batch the provider refuses is split in half and retried, down to single getTransaction calls.
+    Raises RPCUnavailable when the provider rate limits or fails (429 / 5xx): the caller backs off and retries.
+    """
+    with span("get_transactions"):
+        return await _batched("getTransaction", [_tx_params(s) for s in signatures], network, timeout, batch_size)
+
+
+async def get_signatures_for_addresses(
+    queries: list[tuple[str, dict]],
+    network: str = "mainnet",
+    *,
+    batch_size: int = RPC_BATCH_SIZE,
+    timeout: float = GET_SIGNATURES_TIMEOUT_SEC,
+) -> list[list[dict] | None]:
+    """
+    Batched getSignaturesForAddress. queries: [(address, {limit, before, until}), ...].
+    Returns one entry per query, in order: list of { signature, blockTime, err, ... } (newest first) or None on error.
+    """
+    return await _batched("getSignaturesForAddress", [[a, dict(opts)] for a, opts in queries], network, timeout, batch_size)
+
+
+async def _batched(method: str, params_list: list[list], network: str, timeout: float, batch_size: int) -> list:
+    size = max(1, batch_size)
+    chunks = [params_list[i:i + size] for i in range(0, len(params_list), size)]
+    results = await asyncio.gather(*(_batched_chunk(method, c, network, timeout) for c in chunks))
+    return [r for chunk in results for r in chunk]
+
+
+async def _batched_chunk(method: str, params_list: list[list], network: str, timeout: float) -> list:
+    if len(params_list) == 1:
+        data = await _rpc_call(method, params_list[0], network, timeout)
+        return [None if data.get("error") else data.get("result")]
+    try:
+        items = await _rpc_batch([(method, p) for p in params_list], network, timeout)
+    except (BatchRejected, ValueError) as e:
+        log.info("RPC batch of %s %s rejected (%s); splitting", len(params_list), method, e)
+        mid = len(params_list) // 2
+        left, right = await asyncio.gather(
+            _batched_chunk(method, params_list[:mid], network, timeout),
+            _batched_chunk(method, params_list[mid:], network, timeout),
         )
-        data = resp.json()
-        if data.get("error"):
-            return None
-        return data.get("result")
+        return left + right
+    out: list = []
+    for params, item in zip(params_list, items):
+        if item.get("error"):
+            log.debug("%s %s failed in batch: %s", method, str(params[0])[:16], item["error"])
+            out.append(None)
+        else:
+            out.append(item.get("result"))
+    return out
+
+
+class _TransactionBatcher:
+    """Collects getTransaction lookups for RPC_BATCH_WINDOW_SEC (or RPC_BATCH_SIZE items) and sends them as one batch."""
+
+    def __init__(self, network: str) -> None:
+        self.network = network
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()  # running batches (the loop only keeps weak references)
+
+    def get(self, tx_hash: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((tx_hash, fut))
+        if len(self._pending) >= RPC_BATCH_SIZE:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(RPC_BATCH_WINDOW_SEC, self._flush)
+        return fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            results = await get_transactions([s for s, _ in batch], network=self.network)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+async def get_transaction_batched(tx_hash: str, network: str = "mainnet") -> dict | None:
+    """Like get_transaction, but concurrent callers within a few ms share one JSON-RPC batch request."""
+    key = _network_key(network)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        batcher = _batchers[key] = _TransactionBatcher(key)
+    with span("get_transaction_batched"):
+        return await batcher.get(tx_hash)
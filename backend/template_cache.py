@@ -0,0 +1,205 @@
+"""
+Structural explanation cache: transactions with the same shape (programs, instruction types, balance-change
+signs, which amounts are equal) get the same explanation text, only with different amounts and accounts.
+After an LLM explanation, the tx's values are swapped for {{placeholders}} and the template is stored under the
+tx's structural fingerprint; a later tx with the same fingerprint gets the template re-filled with its own values.
+Safety: the fingerprint includes the program IDs and token mints themselves (a template never crosses tokens);
+templates that still contain unplaced numbers or a token symbol / ticker are not stored; low-confidence
+fingerprints (failed txs, many balance changes / instructions) always go to the LLM.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any
+
+from backend.cache import template_cache, template_key
+
+log = logging.getLogger("solana_tx_plain")
+
+TEMPLATE_CACHE_ENABLED = (os.environ.get("TEMPLATE_CACHE_ENABLED") or "1").strip().lower() not in ("0", "false", "no")
+TEMPLATE_MIN_CONFIDENCE = float(os.environ.get("TEMPLATE_MIN_CONFIDENCE") or 0.75)
+MAX_BALANCE_CHANGES = 8
+MAX_INSTRUCTIONS = 12
+
+_PLACEHOLDER = re.compile(r"\{\{([\w.]+)\}\}")
+_BARE_NUMBER = re.compile(r"(?<![\w.{])\d+(?:\.\d+)?(?![\w}])")
+# Words with 2+ consecutive capitals (USDC, $BONK, JitoSOL, JUP) read like token symbols: mint-dependent text.
+_TICKER = re.compile(r"(?<![\w{])\$?[A-Za-z0-9]*[A-Z]{2}[A-Za-z0-9]*(?![\w}])")
+# ... except these, which mean the same for every tx (SOL is the native coin, not a mint).
+MINT_INDEPENDENT_WORDS = {"SOL", "SPL", "NFT", "NFTs", "DEX", "AMM", "ATA", "RPC", "LP", "ID", "IDs", "OK"}
+
+template_stats = {"hits": 0, "misses": 0, "stored": 0, "unsafe": 0, "low_confidence": 0}
+
+
+def _num(x: Any) -> str:
+    return f"{abs(float(x)):.9f}".rstrip("0").rstrip(".") or "0"
+
+
+def _small_int(x: Any) -> bool:
+    """Values like 0, 1, 5 are kept literally (in the fingerprint) instead of templated: they read like ordinary words."""
+    v = abs(float(x or 0))
+    return v < 10 and v == int(v)
+
+
+def _slots(parsed: dict[str, Any]) -> list[tuple[str, Any]]:
+    """Named numeric / account values of a tx, in a fixed order (the same names for structurally identical txs)."""
+    slots: list[tuple[str, Any]] = [("fee", parsed.get("fee_paid") or 0)]
+    for i, c in enumerate(parsed.get("sol_balance_change") or []):
+        slots += [(f"sol{i}.change", c.get("change_sol")), (f"sol{i}.before", c.get("before_sol")), (f"sol{i}.after", c.get("after_sol"))]
+    for i, t in enumerate(parsed.get("token_balance_changes") or []):
+        slots += [(f"tok{i}.change", t.get("change")), (f"tok{i}.before", t.get("before")), (f"tok{i}.after", t.get("after"))]
+    return slots
+
+
+def _accounts(parsed: dict[str, Any]) -> dict[str, str]:
+    out = {f"sol{i}.account": str(c.get("account")) for i, c in enumerate(parsed.get("sol_balance_change") or [])}
+    mints = list(dict.fromkeys(str(t.get("mint")) for t in parsed.get("token_balance_changes") or []))
+    out.update({f"mint{j}": m for j, m in enumerate(mints)})
+    return out
+
+
+def fingerprint(parsed: dict[str, Any]) -> tuple[str, float]:
+    """
+    (fingerprint, confidence). The fingerprint covers program IDs, instruction types, balance-change signs, the
+    token mints, which amounts equal each other and the small-integer amounts. Confidence drops for failed txs
+    and for txs with many balance changes or instructions, where a re-filled template is more likely wrong.
+    """
+    sol = parsed.get("sol_balance_change") or []
+    tokens = parsed.get("token_balance_changes") or []
+    classes: dict[str, int] = {}
+    equality = []
+    for _, value in _slots(parsed):
+        if _small_int(value):
+            equality.append(f"={_num(value)}")
+        else:
+            equality.append(classes.setdefault(_num(value), len(classes)))
+    structure = {
+        "programs": parsed.get("programs_used") or [],
+        "instructions": parsed.get("instruction_types") or [],
+        "n_instructions": parsed.get("num_instructions"),
+        "sol": ["+" if (c.get("change_sol") or 0) > 0 else "-" for c in sol],
+        "tokens": [(str(t.get("mint")), "+" if (t.get("change") or 0) > 0 else "-") for t in tokens],
+        "equality": equality,
+    }
+    digest = hashlib.sha1(json.dumps(structure, sort_keys=True, default=str).encode()).hexdigest()[:20]
+
+    confidence = 1.0
+    logs = (parsed.get("log_preview") or "").lower()
+    if "failed" in logs or "error" in logs or not structure["programs"]:
+        confidence = 0.0
+    if len(sol) + len(tokens) > MAX_BALANCE_CHANGES:
+        confidence *= 0.5
+    if (parsed.get("num_instructions") or 0) > MAX_INSTRUCTIONS:
+        confidence *= 0.5
+    if "unknown" in structure["instructions"]:
+        confidence *= 0.7
+    return f"fp:{digest}", confidence
+
+
+def _variants(parsed: dict[str, Any]) -> dict[str, str]:
+    """Text variant -> placeholder name. Accounts also match without their trailing "..."."""
+    out: dict[str, str] = {}
+    for name, value in _slots(parsed):
+        if not _small_int(value):
+            out.setdefault(_num(value), name)  # equal values share the first name (same in every tx with this fingerprint)
+    for name, account in _accounts(parsed).items():
+        out.setdefault(account, name)
+        if account.endswith("..."):
+            out.setdefault(account[:-3], name)
+    return out
+
+
+def _replace(text: str, pattern: re.Pattern, variants: dict[str, str]) -> str:
+    return pattern.sub(lambda m: "{{" + variants[m.group(0)] + "}}", text)
+
+
+def _map_strings(value: Any, fn) -> Any:
+    if isinstance(value, str):
+        return fn(value)
+    if isinstance(value, dict):
+        return {k: _map_strings(v, fn) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_map_strings(v, fn) for v in value]
+    return value
+
+
+def _strings(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _strings(v)]
+    if isinstance(value, list):
+        return [s for v in value for s in _strings(v)]
+    return []
+
+
+def make_template(parsed: dict[str, Any], ai: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Explanation with this tx's values replaced by {{placeholders}}; None if a number could not be placed or the
+    text names a token (symbol / ticker), which would be wrong for any other mint.
+    """
+    variants = _variants(parsed)
+    if not variants:
+        return None
+    alternatives = "|".join(re.escape(v) for v in sorted(variants, key=len, reverse=True))
+    pattern = re.compile(rf"(?<![\w.])(?:{alternatives})(?![\w]|\.\d)")
+    template = _map_strings({k: v for k, v in ai.items() if k != "prompt_tokens"}, lambda s: _replace(s, pattern, variants))
+    programs = parsed.get("programs_used") or []
+
+    def leftover(s: str) -> bool:
+        for p in programs:
+            s = s.replace(p, "")
+        if any(not _small_int(n) for n in _BARE_NUMBER.findall(s)):
+            return True
+        return any(word.lstrip("$") not in MINT_INDEPENDENT_WORDS for word in _TICKER.findall(s))
+
+    if any(leftover(s) for s in _strings(template)):
+        return None
+    return template
+
+
+def fill_template(template: dict[str, Any], parsed: dict[str, Any]) -> dict[str, Any] | None:
+    """Re-fill a template with parsed's values; None if it references a value parsed does not have."""
+    values = {name: _num(value) for name, value in _slots(parsed)}
+    values.update(_accounts(parsed))
+    if any(name not in values for s in _strings(template) for name in _PLACEHOLDER.findall(s)):
+        return None
+    return _map_strings(template, lambda s: _PLACEHOLDER.sub(lambda m: values[m.group(1)], s))
+
+
+async def templated_explanation(parsed: dict[str, Any], simple_mode: bool, model: str) -> dict[str, Any] | None:
+    """Templated explanation for a structurally known tx, or None (miss, disabled or low confidence)."""
+    if not TEMPLATE_CACHE_ENABLED:
+        return None
+    fp, confidence = fingerprint(parsed)
+    if confidence < TEMPLATE_MIN_CONFIDENCE:
+        template_stats["low_confidence"] += 1
+        return None
+    template, _ = await template_cache.get(template_key(fp, simple_mode, model))
+    ai = fill_template(template, parsed) if template is not None else None
+    template_stats["hits" if ai is not None else "misses"] += 1
+    return ai
+
+
+async def remember_template(parsed: dict[str, Any], simple_mode: bool, model: str, ai: dict[str, Any]) -> None:
+    """Store a template of a fresh LLM explanation under parsed's fingerprint (when it is safe to re-fill)."""
+    if not TEMPLATE_CACHE_ENABLED or ai.get("error"):
+        return
+    fp, confidence = fingerprint(parsed)
+    if confidence < TEMPLATE_MIN_CONFIDENCE:
+        return
+    template = make_template(parsed, ai)
+    if template is None:
+        template_stats["unsafe"] += 1
+        log.debug("Template for %s not stored: unplaced numbers or token symbols in explanation", fp)
+        return
+    await template_cache.set(template_key(fp, simple_mode, model), template)
+    template_stats["stored"] += 1
+
+
+def template_cache_stats() -> dict[str, Any]:
+    lookups = template_stats["hits"] + template_stats["misses"]
+    return {**template_stats, "hit_rate": round(template_stats["hits"] / lookups, 3) if lookups else 0.0}
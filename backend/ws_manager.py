@@ -0,0 +1,218 @@
+"""
+Shared Solana WebSocket connections for live activity.
+Holds a small pool of connections per network and multiplexes many logsSubscribe subscriptions on each,
+routing logsNotification messages by subscription id. Subscriptions are re-sent after a reconnect and
+logsUnsubscribe is sent when the last listener for a wallet goes away.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+import websockets
+
+log = logging.getLogger("solana_tx_plain")
+
+SOLANA_MAINNET_WS = os.environ.get("SOLANA_MAINNET_WS") or "wss://api.mainnet-beta.solana.com"
+SOLANA_DEVNET_WS = os.environ.get("SOLANA_DEVNET_WS") or "wss://api.devnet.solana.com"
+WS_POOL_SIZE = int(os.environ.get("WS_POOL_SIZE") or 4)  # max connections per network
+WS_MAX_SUBS_PER_CONN = int(os.environ.get("WS_MAX_SUBS_PER_CONN") or 500)
+WS_RECONNECT_MAX_SEC = 30.0
+
+NotificationCallback = Callable[[dict[str, Any]], None]
+
+
+def _ws_url(network: str) -> str:
+    return SOLANA_DEVNET_WS if (network or "").strip().lower() == "devnet" else SOLANA_MAINNET_WS
+
+
+class _Connection:
+    """One WebSocket carrying logsSubscribe subscriptions for many wallets."""
+
+    def __init__(self, network: str, dispatch: Callable[[str, str, dict[str, Any]], None]) -> None:
+        self.network = network
+        self.wallets: set[str] = set()  # wanted subscriptions (survive reconnects)
+        self.sub_ids: dict[str, int] = {}  # wallet -> subscription id on the current socket
+        self.by_sub: dict[int, str] = {}
+        self.pending: dict[int, str] = {}  # request id -> wallet awaiting logsSubscribe ack
+        self._dispatch = dispatch
+        self._ws: Any = None
+        self._next_id = 0
+        self._tasks: set[asyncio.Task] = set()  # fire-and-forget unsubscribes (the loop only keeps weak references)
+        self._task = asyncio.create_task(self._run())
+
+    def _request_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    async def add(self, wallet: str) -> None:
+        self.wallets.add(wallet)
+        if self._ws is not None:
+            await self._subscribe(wallet)
+
+    async def remove(self, wallet: str) -> None:
+        self.wallets.discard(wallet)
+        sub_id = self.sub_ids.pop(wallet, None)
+        if sub_id is not None:
+            self.by_sub.pop(sub_id, None)
+            await self._unsubscribe(sub_id)
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _subscribe(self, wallet: str) -> None:
+        rid = self._request_id()
+        self.pending[rid] = wallet
+        await self._send({
+            "jsonrpc": "2.0",
+            "id": rid,
+            "method": "logsSubscribe",
+            "params": [{"mentions": [wallet]}, {"commitment": "confirmed"}],
+        })
+
+    async def _unsubscribe(self, sub_id: int) -> None:
+        await self._send({"jsonrpc": "2.0", "id": self._request_id(), "method": "logsUnsubscribe", "params": [sub_id]})
+
+    async def _send(self, msg: dict[str, Any]) -> None:
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            await ws.send(json.dumps(msg))
+        except Exception as e:
+            # The reader loop notices the broken socket, reconnects and resubscribes.
+            log.debug("WS send failed on %s: %s", self.network, e)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(
+                    _ws_url(self.network),
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=5,
+                ) as ws:
+                    self._ws = ws
+                    backoff = 1.0
+                    self.sub_ids.clear()
+                    self.by_sub.clear()
+                    self.pending.clear()
+                    for wallet in list(self.wallets):
+                        await self._subscribe(wallet)
+                    log.info("WS connected on %s (%s wallet subscriptions)", self.network, len(self.wallets))
+                    async for msg in ws:
+                        self._handle(json.loads(msg))
+            except asyncio.CancelledError:
+                self._ws = None
+                raise
+            except Exception as e:
+                log.warning("Live listener ws error (%s): %s", self.network, e)
+            self._ws = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WS_RECONNECT_MAX_SEC)
+
+    def _handle(self, data: dict[str, Any]) -> None:
+        rid = data.get("id")
+        if rid is not None and rid in self.pending:
+            wallet = self.pending.pop(rid)
+            if data.get("error"):
+                log.warning("logsSubscribe error for %s...: %s", wallet[:12], data["error"])
+                return
+            sub_id = data.get("result")
+            if wallet not in self.wallets or wallet in self.sub_ids:
+                # Wallet went idle (or was re-added) while the ack was in flight: drop the extra subscription.
+                task = asyncio.create_task(self._unsubscribe(sub_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return
+            self.sub_ids[wallet] = sub_id
+            self.by_sub[sub_id] = wallet
+            log.info("Live listener subscribed for wallet %s... on %s (wait for txs from this wallet)", wallet[:12], self.network)
+            return
+        if data.get("method") != "logsNotification":
+            return
+        params = data.get("params") or {}
+        wallet = self.by_sub.get(params.get("subscription"))
+        if wallet is None:
+            return
+        result = params.get("result") or {}
+        self._dispatch(self.network, wallet, result.get("value") or result)
+
+
+class WsManager:
+    """Routes logsNotification values to per-wallet callbacks over a bounded pool of sockets per network."""
+
+    def __init__(self) -> None:
+        self._conns: dict[str, list[_Connection]] = {}
+        self._owner: dict[tuple[str, str], _Connection] = {}
+        self._callbacks: dict[tuple[str, str], list[NotificationCallback]] = {}
+
+    async def subscribe(self, wallet: str, network: str, callback: NotificationCallback) -> None:
+        """callback(value) receives each notification value: { signature, err, logs }."""
+        key = (network, wallet)
+        self._callbacks.setdefault(key, []).append(callback)
+        if key in self._owner:
+            return
+        conn = self._pick(network)
+        self._owner[key] = conn
+        await conn.add(wallet)
+
+    async def unsubscribe(self, wallet: str, network: str, callback: NotificationCallback) -> None:
+        key = (network, wallet)
+        callbacks = self._callbacks.get(key)
+        if not callbacks:
+            return
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if callbacks:
+            return
+        del self._callbacks[key]
+        conn = self._owner.pop(key, None)
+        if conn is None:
+            return
+        await conn.remove(wallet)
+        if not conn.wallets:
+            self._conns.get(network, []).remove(conn)
+            await conn.close()
+
+    def _pick(self, network: str) -> _Connection:
+        conns = self._conns.setdefault(network, [])
+        with_room = [c for c in conns if len(c.wallets) < WS_MAX_SUBS_PER_CONN]
+        if with_room:
+            return min(with_room, key=lambda c: len(c.wallets))
+        if len(conns) < WS_POOL_SIZE:
+            conn = _Connection(network, self._dispatch)
+            conns.append(conn)
+            return conn
+        return min(conns, key=lambda c: len(c.wallets))
+
+    def _dispatch(self, network: str, wallet: str, value: dict[str, Any]) -> None:
+        for callback in list(self._callbacks.get((network, wallet), ())):
+            try:
+                callback(value)
+            except Exception as e:
+                log.warning("WS notification callback failed: %s", e)
+
+    async def close(self) -> None:
+        conns = [c for cs in self._conns.values() for c in cs]
+        self._conns.clear()
+        self._owner.clear()
+        self._callbacks.clear()
+        await asyncio.gather(*(c.close() for c in conns), return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "connections": sum(len(cs) for cs in self._conns.values()),
+            "subscriptions": len(self._owner),
+        }
+
+
+ws_manager = WsManager()
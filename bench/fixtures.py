@@ -0,0 +1,147 @@
+"""
+Transaction fixtures for the offline load benchmark (bench.load_bench).
+Fixtures are getTransaction results (jsonParsed) keyed by signature. Record real ones with
+    python -m bench.fixtures record SIG [SIG ...] --out bench/fixtures --rpc https://api.mainnet-beta.solana.com
+and pass --fixtures bench/fixtures to the benchmark; without recorded fixtures a built-in mix of
+synthetic SOL transfers, SPL token transfers (rules fast path) and swaps (LLM path) is used.
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+ATA_PROGRAM = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+SWAP_PROGRAM = "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qMJUSfYLR8ZpzHdEG6cY6nZk2L"
+BONK_MINT = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+
+# Share of each shape in the synthetic mix (swaps need the LLM, the others take the rules fast path).
+SYNTHETIC_MIX = (("sol_transfer", 0.4), ("token_transfer", 0.3), ("swap", 0.3))
+
+
+def _key(n: int) -> str:
+    return f"Bench{n:039d}"
+
+
+def _logs(*programs: str) -> list[str]:
+    out = []
+    for p in programs:
+        out += [f"Program {p} invoke [1]", f"Program {p} consumed 2100 of 200000 compute units", f"Program {p} success"]
+    return out
+
+
+def _tx(rng: random.Random, shape: str) -> dict[str, Any]:
+    payer, other = _key(rng.randrange(10**6)), _key(rng.randrange(10**6))
+    lamports = rng.randrange(10**6, 5 * 10**9)
+    pre = [rng.randrange(6 * 10**9, 50 * 10**9), rng.randrange(0, 10**9)]
+    fee = 5000
+    pre_tokens: list[dict] = []
+    post_tokens: list[dict] = []
+
+    def token(i: int, mint: str, amount: float) -> dict:
+        return {"accountIndex": i, "mint": mint, "owner": payer, "uiTokenAmount": {"uiAmount": amount}}
+
+    if shape == "sol_transfer":
+        post = [pre[0] - lamports - fee, pre[1] + lamports]
+        instructions = [{"programId": SYSTEM_PROGRAM, "program": "system", "parsed": {"type": "transfer"}}]
+        programs = (SYSTEM_PROGRAM,)
+    elif shape == "token_transfer":
+        amount = float(rng.randrange(1, 10**5))
+        held = amount + rng.randrange(0, 10**5)
+        post = [pre[0] - fee, pre[1]]
+        pre_tokens = [token(2, USDC_MINT, held), token(3, USDC_MINT, 0.0)]
+        post_tokens = [token(2, USDC_MINT, held - amount), token(3, USDC_MINT, amount)]
+        instructions = [{"programId": TOKEN_PROGRAM, "program": "spl-token", "parsed": {"type": "transfer"}}]
+        programs = (TOKEN_PROGRAM,)
+    else:
+        sold, bought = float(rng.randrange(1, 500)), float(rng.randrange(10**5, 10**8))
+        post = [pre[0] - fee - 2_039_280, pre[1]]
+        pre_tokens = [token(2, USDC_MINT, sold + rng.randrange(0, 1000))]
+        post_tokens = [token(2, USDC_MINT, pre_tokens[0]["uiTokenAmount"]["uiAmount"] - sold), token(3, BONK_MINT, bought)]
+        instructions = [
+            {"programId": ATA_PROGRAM},
+            {"programId": SWAP_PROGRAM},
+            {"programId": TOKEN_PROGRAM, "program": "spl-token", "parsed": {"type": "transferChecked"}},
+        ]
+        programs = (ATA_PROGRAM, SWAP_PROGRAM, TOKEN_PROGRAM)
+    return {
+        "slot": 250_000_000 + rng.randrange(10**6),
+        "blockTime": 1_700_000_000 + rng.randrange(10**6),
+        "meta": {
+            "err": None,
+            "fee": fee,
+            "preBalances": pre + [2_039_280, 0],
+            "postBalances": post + [2_039_280, 2_039_280 if shape == "swap" else 0],
+            "preTokenBalances": pre_tokens,
+            "postTokenBalances": post_tokens,
+            "logMessages": _logs(*programs),
+        },
+        "transaction": {
+            "signatures": [],
+            "message": {
+                "accountKeys": [{"pubkey": k} for k in (payer, other, _key(rng.randrange(10**6)), _key(rng.randrange(10**6)))],
+                "instructions": instructions,
+            },
+        },
+    }
+
+
+def synthetic_fixtures(n: int = 200, seed: int = 0) -> list[dict[str, Any]]:
+    """n getTransaction results in the SYNTHETIC_MIX proportions."""
+    rng = random.Random(seed)
+    shapes = [s for s, _ in SYNTHETIC_MIX]
+    weights = [w for _, w in SYNTHETIC_MIX]
+    return [_tx(rng, rng.choices(shapes, weights)[0]) for _ in range(n)]
+
+
+def load_fixtures(directory: str | Path) -> list[dict[str, Any]]:
+    """Recorded getTransaction results: one <signature>.json per file."""
+    out = []
+    for path in sorted(Path(directory).glob("*.json")):
+        raw = json.loads(path.read_text())
+        if raw:
+            out.append(raw)
+    if not out:
+        raise SystemExit(f"No fixtures (*.json) in {directory}")
+    return out
+
+
+def record(signatures: list[str], out_dir: str, rpc_url: str) -> None:
+    """Save getTransaction results (same params as backend.solana_client) as <signature>.json."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    with httpx.Client(timeout=30) as client:
+        for sig in signatures:
+            body = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getTransaction",
+                "params": [sig, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}],
+            }
+            result = client.post(rpc_url, json=body).json().get("result")
+            if not result:
+                print(f"{sig}: not found")
+                continue
+            (out / f"{sig}.json").write_text(json.dumps(result))
+            print(f"{sig}: saved")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record getTransaction fixtures for bench.load_bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("signatures", nargs="+")
+    rec.add_argument("--out", default="bench/fixtures")
+    rec.add_argument("--rpc", default="https://api.mainnet-beta.solana.com")
+    args = parser.parse_args()
+    record(args.signatures, args.out, args.rpc)
+
+
+if __name__ == "__main__":
+    main()
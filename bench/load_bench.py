@@ -0,0 +1,322 @@
+"""
+Offline load benchmark: the real backend (bench.serve, in a subprocess) against local stand-ins for the
+Solana RPC, the logsSubscribe WebSocket and Gemini / OpenRouter (bench.stubs). No network access needed.
+Run from project root:
+    python -m bench.load_bench --duration 20 --concurrency 16 --sse-clients 100 --wallets 10
+Phases:
+  explain  POST /explain from --concurrency workers with unique signatures (cache misses; the template cache
+           and the rules fast path still apply) for --duration seconds.
+  live     --sse-clients /live/stream clients over --wallets wallets; the stub WebSocket notifies each wallet
+           at --ws-rate signatures/s. Latency is from the stub sending the signature to a client receiving
+           the "activity" event that contains it.
+Reports throughput, p50/p95/p99 latency, server memory per SSE client (RSS; Linux /proc or psutil), LLM
+calls per transaction and the mean time per pipeline stage (from the backend's /metrics). LLM rate limits default to effectively unlimited so the app itself is measured;
+--rpc-endpoints N starts N RPC stubs (the first one optionally slower / rate limited via --rpc-first-*) to
+measure endpoint selection, failover and hedging (export RPC_HEDGE=1);
+export GEMINI_RPM / OPENROUTER_RPM to benchmark with real quotas. --json prints the report as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from bench.fixtures import load_fixtures, synthetic_fixtures
+from bench.stubs import StubLLM, StubRPC, StubWS
+
+ROOT = Path(__file__).resolve().parent.parent
+_STAGE_LINE = re.compile(r'^solana_tx_plain_stage_duration_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$', re.MULTILINE)
+
+
+def percentiles(samples: list[float]) -> dict[str, float | None]:
+    """p50 / p95 / p99 in milliseconds (nearest rank)."""
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+    return {"p50_ms": rank(0.50), "p95_ms": rank(0.95), "p99_ms": rank(0.99)}
+
+
+def rss_bytes(pid: int) -> int | None:
+    """Resident set size of a process, or None when it cannot be read on this platform."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(rpcs: list[StubRPC], ws: StubWS, llm: StubLLM, provider: str) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ)
+    rpc_urls = ",".join(rpc.url for rpc in rpcs)
+    env.update({
+        "SOLANA_MAINNET_RPC": rpc_urls,
+        "SOLANA_DEVNET_RPC": rpc_urls,
+        "SOLANA_MAINNET_WS": ws.url,
+        "SOLANA_DEVNET_WS": ws.url,
+        "OPENROUTER_URL": f"{llm.url}/chat/completions",
+        "BENCH_GEMINI_URL": llm.url,
+    })
+    env.pop("GEMINI_API_KEY", None)
+    env.pop("OPENROUTER_API_KEY", None)
+    if provider in ("gemini", "both"):
+        env["GEMINI_API_KEY"] = "bench"
+    if provider in ("openrouter", "both"):
+        env["OPENROUTER_API_KEY"] = "bench"
+    env.setdefault("GEMINI_RPM", "1000000")
+    env.setdefault("OPENROUTER_RPM", "1000000")
+    proc = subprocess.Popen([sys.executable, "-m", "bench.serve", "--port", str(port)], cwd=ROOT, env=env)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(client: httpx.AsyncClient, base: str, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Backend exited with code {proc.returncode}")
+        try:
+            if (await client.get(f"{base}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("Backend did not become ready")
+
+
+async def explain_phase(client: httpx.AsyncClient, base: str, llm: StubLLM, concurrency: int, duration: float) -> dict[str, Any]:
+    latencies: list[float] = []
+    explainers: dict[str, int] = {}
+    errors = 0
+    counter = iter(range(10**9))
+    llm_before = llm.calls()
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            sig = f"bench-explain-{next(counter)}"
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(f"{base}/explain", json={"tx_hash": sig, "network": "mainnet", "simple_mode": True})
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code != 200:
+                errors += 1
+                continue
+            explainer = r.json().get("explainer") or "unknown"
+            explainers[explainer] = explainers.get(explainer, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ok = sum(explainers.values())
+    return {
+        "requests": ok + errors,
+        "ok": ok,
+        "errors": errors,
+        "throughput_rps": round(ok / elapsed, 1),
+        **percentiles(latencies),
+        "explainers": explainers,
+        "llm_calls_per_tx": round((llm.calls() - llm_before) / ok, 3) if ok else None,
+    }
+
+
+async def live_phase(
+    client: httpx.AsyncClient,
+    base: str,
+    proc: subprocess.Popen,
+    ws: StubWS,
+    llm: StubLLM,
+    *,
+    sse_clients: int,
+    wallets: int,
+    rate: float,
+    burst: int,
+    duration: float,
+) -> dict[str, Any]:
+    names = [f"BenchWallet{i:033d}" for i in range(wallets)]
+    latencies: list[float] = []
+    received = {"events": 0, "txs": 0}
+    connected = 0
+    rss_before = rss_bytes(proc.pid)
+
+    async def sse_client(wallet: str) -> None:
+        nonlocal connected
+        async with client.stream("GET", f"{base}/live/stream", params={"wallet": wallet}, timeout=None) as r:
+            connected += 1
+            async for line in r.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[6:])
+                if event.get("type") != "activity":
+                    continue
+                now = time.perf_counter()
+                received["events"] += 1
+                for sig in event.get("signatures") or []:
+                    sent = ws.sent_at.get(sig)
+                    if sent is not None:
+                        received["txs"] += 1
+                        latencies.append(now - sent)
+
+    tasks = [asyncio.create_task(sse_client(names[i % wallets])) for i in range(sse_clients)]
+    deadline = time.perf_counter() + 30
+    while (connected < sse_clients or len(ws.wallets()) < wallets) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+    await asyncio.sleep(0.5)
+    rss_connected = rss_bytes(proc.pid)
+    llm_before = llm.calls()
+
+    started = time.perf_counter()
+    sent = await ws.replay(rate, duration, burst)
+    await asyncio.sleep(5)  # let the last groups close and be explained
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    per_client = None
+    if rss_before is not None and rss_connected is not None and sse_clients:
+        per_client = round((rss_connected - rss_before) / sse_clients / 1024, 1)
+    return {
+        "sse_clients": connected,
+        "wallets": len(names),
+        "txs_notified": sent,
+        "activity_events": received["events"],
+        "events_per_sec": round(received["events"] / elapsed, 1),
+        "tx_deliveries": received["txs"],
+        **percentiles(latencies),
+        "server_rss_mb": round(rss_connected / 2**20, 1) if rss_connected else None,
+        "memory_per_sse_client_kb": per_client,
+        "llm_calls_per_tx": round((llm.calls() - llm_before) / sent, 3) if sent else None,
+    }
+
+
+async def stage_timings(client: httpx.AsyncClient, base: str) -> dict[str, str]:
+    """Mean time per pipeline stage from the backend's /metrics histograms."""
+    text = (await client.get(f"{base}/metrics")).text
+    totals: dict[str, dict[str, float]] = {}
+    for kind, stage, value in _STAGE_LINE.findall(text):
+        totals.setdefault(stage, {})[kind] = float(value)
+    return {
+        stage: f"{t['count']:.0f} x {t['sum'] / t['count'] * 1000:.2f} ms"
+        for stage, t in totals.items()
+        if t.get("count")
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    for phase, results in report.items():
+        print(f"\n== {phase} ==")
+        for key, value in results.items():
+            print(f"  {key:<26} {value}")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+    rpcs = [StubRPC(fixtures, latency_sec=args.rpc_latency_ms / 1000) for _ in range(args.rpc_endpoints)]
+    if args.rpc_first_latency_ms is not None:
+        rpcs[0].latency_sec = args.rpc_first_latency_ms / 1000
+    rpcs[0].error_rate = args.rpc_first_429_rate
+    ws = StubWS()
+    llm = StubLLM(latency_sec=args.llm_latency_ms / 1000, error_rate=args.llm_429_rate)
+    for rpc in rpcs:
+        await rpc.start()
+    await ws.start()
+    await llm.start()
+    proc, base = start_server(rpcs, ws, llm, args.provider)
+    limits = httpx.Limits(max_connections=args.concurrency + args.sse_clients + 10, max_keepalive_connections=args.concurrency + 10)
+    report: dict[str, Any] = {}
+    try:
+        async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+            await wait_ready(client, base, proc)
+            if "explain" in args.phases:
+                report["explain"] = await explain_phase(client, base, llm, args.concurrency, args.duration)
+            if "live" in args.phases:
+                report["live"] = await live_phase(
+                    client, base, proc, ws, llm,
+                    sse_clients=args.sse_clients,
+                    wallets=args.wallets,
+                    rate=args.ws_rate,
+                    burst=args.burst,
+                    duration=args.duration,
+                )
+            report["stages"] = await stage_timings(client, base)
+        report["stubs"] = {
+            "rpc_http_requests": [rpc.counters["http_requests"] for rpc in rpcs],
+            "rpc_calls": [rpc.counters["calls"] for rpc in rpcs],
+            "rpc_rate_limited": [rpc.counters["rate_limited"] for rpc in rpcs],
+            "llm_gemini": llm.counters["gemini"],
+            "llm_openrouter": llm.counters["openrouter"],
+            "llm_rate_limited": llm.counters["rate_limited"],
+            "ws_notifications": ws.counters["notifications"],
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        await llm.stop()
+        await ws.stop()
+        for rpc in rpcs:
+            await rpc.stop()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load benchmark for /explain and /live/stream")
+    parser.add_argument("--phases", default="explain,live", help="comma-separated: explain, live")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent /explain workers")
+    parser.add_argument("--sse-clients", type=int, default=50)
+    parser.add_argument("--wallets", type=int, default=10)
+    parser.add_argument("--ws-rate", type=float, default=1.0, help="notified signatures per second per wallet")
+    parser.add_argument("--burst", type=int, default=1, help="signatures notified together (one multi-tx action)")
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0)
+    parser.add_argument("--rpc-endpoints", type=int, default=1, help="RPC stubs passed to the backend as a list")
+    parser.add_argument("--rpc-first-latency-ms", type=float, help="latency of the first RPC stub (a slow endpoint)")
+    parser.add_argument("--rpc-first-429-rate", type=float, default=0.0, help="share of requests the first RPC stub rate limits")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="share of LLM calls answered with 429")
+    parser.add_argument("--provider", choices=("gemini", "openrouter", "both"), default="both")
+    parser.add_argument("--fixtures", help="directory of recorded getTransaction results (bench.fixtures record)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    args.phases = {p.strip() for p in args.phases.split(",") if p.strip()}
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
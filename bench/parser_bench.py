@@ -0,0 +1,70 @@
+"""
+Benchmark: parse_tx / parse_many scaling on synthetic transactions with thousands of token accounts.
+Run from project root: python -m bench.parser_bench
+Per-account time should stay flat as the account count grows (linear scaling).
+"""
+
+import gc
+import random
+import time
+
+from backend.parser import parse_many, parse_tx
+
+
+def synthetic_tx(n_accounts: int, seed: int = 0) -> dict:
+    """RPC-shaped getTransaction result with n_accounts SOL accounts and n_accounts token balances."""
+    rng = random.Random(seed)
+    keys = [{"pubkey": f"Acct{i:040d}"} for i in range(n_accounts)]
+    pre = [rng.randrange(0, 10**10) for _ in range(n_accounts)]
+    post = [b + rng.choice((0, 0, 5000, -5000)) for b in pre]
+    mints = [f"Mint{i % 50:040d}" for i in range(n_accounts)]
+
+    def token(i: int, amount: float) -> dict:
+        return {"accountIndex": i, "mint": mints[i], "uiTokenAmount": {"uiAmount": amount}}
+
+    pre_token = [token(i, float(i)) for i in range(n_accounts) if i % 10 != 0]  # 10% created in this tx
+    post_token = [token(i, float(i) + rng.choice((0, 0, 1.5))) for i in range(n_accounts) if i % 7 != 0]
+    rng.shuffle(post_token)
+    return {
+        "slot": 1,
+        "blockTime": 1700000000,
+        "meta": {
+            "fee": 5000,
+            "preBalances": pre,
+            "postBalances": post,
+            "preTokenBalances": pre_token,
+            "postTokenBalances": post_token,
+            "logMessages": [],
+        },
+        "transaction": {"message": {"accountKeys": keys, "instructions": []}},
+    }
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-repeat wall time with GC paused (like timeit)."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return best
+
+
+def main() -> None:
+    print(f"{'accounts':>9} {'parse_tx ms':>12} {'us/account':>11}")
+    for n in (250, 500, 1000, 2000, 4000, 8000):
+        tx = synthetic_tx(n)
+        sec = _time(lambda: parse_tx(tx), repeat=5)
+        print(f"{n:>9} {sec * 1000:>12.2f} {sec / n * 1e6:>11.2f}")
+
+    raws = [synthetic_tx(200, seed=i) for i in range(500)]
+    sec = _time(lambda: parse_many(raws), repeat=3)
+    print(f"parse_many: {len(raws)} txs x 200 accounts in {sec * 1000:.1f} ms ({sec / len(raws) * 1e6:.0f} us/tx)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Run the backend against the benchmark stubs (started as a subprocess by bench.load_bench).
+python -m bench.serve --port 8765   (with SOLANA_*_RPC / SOLANA_*_WS / OPENROUTER_URL / BENCH_GEMINI_URL set)
+- .env files are not loaded, so real keys or endpoints can never leak into a benchmark run.
+- The Gemini SDK has no async REST transport that could be pointed at a local URL, so when BENCH_GEMINI_URL
+  is set its GenerativeModel is replaced by a small client speaking the same REST API (generateContent /
+  streamGenerateContent) to the stub; 429s surface as the SDK's ResourceExhausted.
+"""
+
+import argparse
+import json
+import logging
+import os
+from typing import Any
+
+import dotenv
+import httpx
+from google.api_core.exceptions import ResourceExhausted
+
+
+class _Part:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _Response:
+    """The parts of GenerateContentResponse that backend.ai_explain reads."""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.candidates = data.get("candidates") or []
+        self.prompt_feedback = None
+        parts = (self.candidates[0].get("content") or {}).get("parts") or [] if self.candidates else []
+        self.text = "".join(p.get("text") or "" for p in parts)
+
+
+class _Stream:
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+
+    async def __aiter__(self):
+        try:
+            async for line in self._response.aiter_lines():
+                if line.startswith("data: "):
+                    yield _Response(json.loads(line[6:]))
+        finally:
+            await self._response.aclose()
+
+
+class BenchGenerativeModel:
+    _client: httpx.AsyncClient | None = None
+
+    def __init__(self, model_name: str = "gemini-2.0-flash", **_: Any) -> None:
+        self.model_name = model_name
+        self.base = os.environ["BENCH_GEMINI_URL"].rstrip("/")
+
+    @classmethod
+    def client(cls) -> httpx.AsyncClient:
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=200))
+        return cls._client
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, **_: Any):
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        request = self.client().build_request(
+            "POST", f"{self.base}/v1beta/models/{self.model_name}:{method}", json={"contents": [{"parts": [{"text": prompt}]}]}
+        )
+        response = await self.client().send(request, stream=stream)
+        if response.status_code == 429:
+            await response.aclose()
+            raise ResourceExhausted("Resource has been exhausted (e.g. check quota).")
+        if response.status_code >= 400:
+            await response.aread()
+            raise RuntimeError(f"{response.status_code} {response.text[:200]}")
+        return _Stream(response) if stream else _Response(response.json())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backend wired to the benchmark stubs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--log-level", default="WARNING", help="backend log level (INFO logs every tx)")
+    args = parser.parse_args()
+
+    dotenv.load_dotenv = lambda *a, **k: False  # before backend.main is imported
+    import uvicorn
+
+    from backend import ai_explain
+
+    if os.environ.get("BENCH_GEMINI_URL"):
+        ai_explain.genai.GenerativeModel = BenchGenerativeModel
+    from backend.main import app
+
+    logging.getLogger().setLevel(args.log_level.upper())
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Local stand-ins for everything the backend talks to, for the offline load benchmark (bench.load_bench).
+- StubRPC: Solana JSON-RPC (single and batch) serving getTransaction from fixtures and synthetic
+  getSignaturesForAddress pages, with a configurable latency and 429 injection (several instances stand in
+  for several RPC endpoints).
+- StubWS: logsSubscribe WebSocket that pushes logsNotification messages to every subscribed wallet at a
+  configurable rate; records when each signature was sent so end-to-end latency can be measured.
+- StubLLM: fake Gemini (generateContent / streamGenerateContent) and OpenRouter (chat/completions, also
+  streamed) with configurable latency and 429 injection. Answers echo the section labels the prompt asks
+  for, one "=== GROUP n ===" block per group for batched live prompts.
+All three run on the benchmark's event loop; counters are plain dicts read by the benchmark.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+import zlib
+from typing import Any
+
+import uvicorn
+import websockets
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+
+_LABEL = re.compile(r"^([A-Z_]+): \[", re.MULTILINE)
+_GROUP = re.compile(r"^=== GROUP (\d+) === \(", re.MULTILINE)
+
+
+async def _serve(app: FastAPI) -> tuple[uvicorn.Server, asyncio.Task, str]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+class StubRPC:
+    def __init__(self, fixtures: list[dict[str, Any]], latency_sec: float = 0.0, error_rate: float = 0.0) -> None:
+        self.fixtures = fixtures
+        self.latency_sec = latency_sec
+        self.error_rate = error_rate  # share of HTTP requests answered with 429
+        self.counters = {"http_requests": 0, "calls": 0, "getTransaction": 0, "getSignaturesForAddress": 0, "rate_limited": 0}
+        self.url = ""
+        self.app = FastAPI()
+        self.app.post("/")(self._handle)
+
+    def transaction(self, signature: str) -> dict[str, Any]:
+        """The fixture for a signature (stable: the same signature always gets the same tx)."""
+        raw = self.fixtures[zlib.crc32(signature.encode()) % len(self.fixtures)]
+        tx = dict(raw.get("transaction") or {})
+        tx["signatures"] = [signature]
+        return {**raw, "transaction": tx}
+
+    def _signatures(self, address: str, options: dict[str, Any]) -> list[dict[str, Any]]:
+        limit = int(options.get("limit") or 10)
+        before = options.get("before")
+        start = int(before.rsplit("-", 1)[1]) + 1 if before and before.rsplit("-", 1)[-1].isdigit() else 0
+        return [
+            {"signature": f"{address[:8]}-hist-{i}", "blockTime": 1_700_000_000 - i * 3, "err": None}
+            for i in range(start, start + limit)
+        ]
+
+    def _one(self, call: dict[str, Any]) -> dict[str, Any]:
+        self.counters["calls"] += 1
+        method = call.get("method")
+        params = call.get("params") or []
+        if method == "getTransaction":
+            self.counters["getTransaction"] += 1
+            result: Any = self.transaction(params[0])
+        elif method == "getSignaturesForAddress":
+            self.counters["getSignaturesForAddress"] += 1
+            result = self._signatures(params[0], params[1] if len(params) > 1 else {})
+        else:
+            return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+    async def _handle(self, request: Request) -> Response:
+        try:
+            body = await request.json()
+        except ClientDisconnect:  # a hedged request cancelled by the backend
+            return Response(status_code=499)
+        self.counters["http_requests"] += 1
+        if self.latency_sec:
+            await asyncio.sleep(self.latency_sec)
+        if random.random() < self.error_rate:
+            self.counters["rate_limited"] += 1
+            return JSONResponse({"jsonrpc": "2.0", "error": {"code": 429, "message": "Too many requests"}}, status_code=429)
+        out = [self._one(c) for c in body] if isinstance(body, list) else self._one(body)
+        return JSONResponse(out)
+
+    async def start(self) -> None:
+        self._server, self._task, self.url = await _serve(self.app)
+
+    async def stop(self) -> None:
+        self._server.should_exit = True
+        await self._task
+
+
+class StubWS:
+    def __init__(self) -> None:
+        self.subscriptions: dict[int, tuple[Any, str]] = {}  # subscription id -> (socket, wallet)
+        self.sent_at: dict[str, float] = {}  # signature -> perf_counter() when notified
+        self.counters = {"connections": 0, "subscribes": 0, "unsubscribes": 0, "notifications": 0}
+        self.url = ""
+        self._ids = itertools.count(1)
+
+    async def _handler(self, ws: Any) -> None:
+        self.counters["connections"] += 1
+        try:
+            async for message in ws:
+                msg = json.loads(message)
+                if msg.get("method") == "logsSubscribe":
+                    sub_id = next(self._ids)
+                    wallet = ((msg.get("params") or [{}])[0].get("mentions") or [""])[0]
+                    self.subscriptions[sub_id] = (ws, wallet)
+                    self.counters["subscribes"] += 1
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": msg.get("id"), "result": sub_id}))
+                elif msg.get("method") == "logsUnsubscribe":
+                    self.subscriptions.pop((msg.get("params") or [None])[0], None)
+                    self.counters["unsubscribes"] += 1
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": msg.get("id"), "result": True}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for sub_id in [s for s, (sock, _) in self.subscriptions.items() if sock is ws]:
+                del self.subscriptions[sub_id]
+
+    def wallets(self) -> set[str]:
+        return {wallet for _, wallet in self.subscriptions.values()}
+
+    async def notify(self, wallet: str, signature: str) -> None:
+        self.sent_at.setdefault(signature, time.perf_counter())
+        for sub_id, (ws, w) in list(self.subscriptions.items()):
+            if w != wallet:
+                continue
+            msg = {
+                "jsonrpc": "2.0",
+                "method": "logsNotification",
+                "params": {"subscription": sub_id, "result": {"context": {"slot": 1}, "value": {"signature": signature, "err": None, "logs": []}}},
+            }
+            try:
+                await ws.send(json.dumps(msg))
+                self.counters["notifications"] += 1
+            except websockets.ConnectionClosed:
+                pass
+
+    async def replay(self, rate_per_wallet: float, duration_sec: float, burst: int = 1) -> int:
+        """Notify every subscribed wallet: `burst` signatures at a time, rate_per_wallet signatures/s on average."""
+        interval = burst / rate_per_wallet
+        deadline = time.perf_counter() + duration_sec
+        sent = 0
+        tick = 0
+        while time.perf_counter() < deadline:
+            for wallet in sorted(self.wallets()):
+                for k in range(burst):
+                    await self.notify(wallet, f"{wallet[:8]}-live-{tick}-{k}")
+                    sent += 1
+            tick += 1
+            await asyncio.sleep(interval)
+        return sent
+
+    async def start(self) -> None:
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+class StubLLM:
+    def __init__(self, latency_sec: float = 0.5, error_rate: float = 0.0, stream_chunks: int = 8) -> None:
+        self.latency_sec = latency_sec
+        self.error_rate = error_rate  # share of calls answered with 429
+        self.stream_chunks = stream_chunks
+        self.counters = {"gemini": 0, "openrouter": 0, "rate_limited": 0, "prompt_chars": 0}
+        self.url = ""
+        self.app = FastAPI()
+        self.app.post("/chat/completions")(self._openrouter)
+        self.app.post("/v1beta/models/{target}")(self._gemini)
+
+    @staticmethod
+    def answer(prompt: str) -> str:
+        """Sectioned reply for whatever labels (and GROUP blocks) the prompt asks for."""
+        labels = list(dict.fromkeys(_LABEL.findall(prompt)))
+        block = "\n".join(f"{label}: Benchmark answer for {label.lower().replace('_', ' ')}." for label in labels)
+        groups = _GROUP.findall(prompt)
+        if not groups:
+            return block
+        return "\n".join(f"=== GROUP {n} ===\n{block}" for n in groups)
+
+    def _chunks(self, text: str) -> list[str]:
+        size = max(1, len(text) // self.stream_chunks + 1)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    async def _call(self, provider: str, prompt: str) -> str | None:
+        """Count the call and wait out the latency; None means answer 429."""
+        self.counters[provider] += 1
+        self.counters["prompt_chars"] += len(prompt)
+        if random.random() < self.error_rate:
+            self.counters["rate_limited"] += 1
+            return None
+        await asyncio.sleep(self.latency_sec)
+        return self.answer(prompt)
+
+    async def _openrouter(self, request: Request) -> Response:
+        body = await request.json()
+        prompt = "\n".join(m.get("content") or "" for m in body.get("messages") or [])
+        text = await self._call("openrouter", prompt)
+        if text is None:
+            return JSONResponse({"error": {"code": 429, "message": "Rate limit exceeded"}}, status_code=429)
+        if not body.get("stream"):
+            return JSONResponse({"choices": [{"message": {"content": text}}]})
+
+        async def events():
+            for chunk in self._chunks(text):
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def _gemini(self, target: str, request: Request) -> Response:
+        body = await request.json()
+        prompt = "\n".join(p.get("text") or "" for c in body.get("contents") or [] for p in c.get("parts") or [])
+        text = await self._call("gemini", prompt)
+        if text is None:
+            return JSONResponse({"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).", "status": "RESOURCE_EXHAUSTED"}}, status_code=429)
+
+        def candidate(part: str) -> dict[str, Any]:
+            return {"candidates": [{"content": {"parts": [{"text": part}], "role": "model"}, "finishReason": "STOP"}]}
+
+        if not target.endswith(":streamGenerateContent"):
+            return JSONResponse(candidate(text))
+
+        async def events():
+            for chunk in self._chunks(text):
+                yield f"data: {json.dumps(candidate(chunk))}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    def calls(self) -> int:
+        return self.counters["gemini"] + self.counters["openrouter"]
+
+    async def start(self) -> None:
+        self._server, self._task, self.url = await _serve(self.app)
+
+    async def stop(self) -> None:
+        self._server.should_exit = True
+        await self._task